@@ -0,0 +1,50 @@
+# mcp-servers/common.py
+"""Helpers shared by the communication and user context MCP servers"""
+import asyncio
+import atexit
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, List
+from mcp.types import TextContent
+
+def configure_logging(default_level: int = logging.WARNING):
+    """Route log records through a queue to stderr.
+
+    A listener thread writes the records, so logging never blocks the event
+    loop on I/O. stdout carries the JSON-RPC stream, so nothing else may be
+    written there. Set MCP_DEBUG=1 for per-call diagnostics.
+    """
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, logging.StreamHandler(sys.stderr))
+    logging.basicConfig(
+        level=logging.DEBUG if os.getenv("MCP_DEBUG") == "1" else default_level,
+        handlers=[QueueHandler(log_queue)]
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+class JsonResults:
+    """Wraps tool results as the single JSON text content block of a response.
+
+    Encoding a long result list takes milliseconds, so results whose list_key
+    list is longer than offload_threshold are serialized in a worker thread
+    to keep other tool calls responsive.
+    """
+
+    def __init__(self, dumps: Callable[[Any], str], list_key: str, offload_threshold: int):
+        self.dumps = dumps
+        self.list_key = list_key
+        self.offload_threshold = offload_threshold
+
+    def wrap_json(self, obj: Any) -> List[TextContent]:
+        """Wrap a tool result as the single JSON text content block"""
+        return [TextContent(type="text", text=self.dumps(obj))]
+
+    async def wrap_result(self, obj: Dict) -> List[TextContent]:
+        """Wrap a handler result, encoding large result lists off the event loop"""
+        if len(obj.get(self.list_key, ())) > self.offload_threshold:
+            return [TextContent(type="text", text=await asyncio.to_thread(self.dumps, obj))]
+        return self.wrap_json(obj)
@@ -1,15 +1,19 @@
 # mcp-servers/communication-server/integrations/gmail.py
 import os
 import asyncio
+import logging
+import threading
 from datetime import datetime, timedelta
 from email.utils import parsedate_to_datetime
 from typing import List, Dict, Optional
 from pathlib import Path
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, OrderedDict
 
+import requests
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from dotenv import load_dotenv
 
 try:
@@ -24,8 +28,24 @@ except ImportError:
 env_path = Path(__file__).parent.parent.parent.parent / ".env"
 load_dotenv(dotenv_path=env_path, override=True)
 
+logger = logging.getLogger(__name__)
+
 SCOPES = ["https://www.googleapis.com/auth/gmail.readonly"]
 
+# Gmail accepts up to 100 calls per batch but rate limits batches above 50
+GMAIL_BATCH_SIZE = 50
+
+# Gmail calls running at once, to stay under the per-user QPS limit. Each
+# call is one executor job issuing its requests one after another.
+MAX_CONCURRENT_API_CALLS = int(os.getenv("MCP_MAX_CONCURRENT_API_CALLS", "8"))
+
+# Most recently checked sender domains kept by check_sender_domain
+DOMAIN_INFO_CACHE_MAX_ENTRIES = 1024
+
+# Priority keywords, matched as substrings of the lowercased subject
+URGENT_KEYWORDS = frozenset({"urgent", "asap", "emergency", "critical", "immediate"})
+HIGH_KEYWORDS = frozenset({"deadline", "meeting", "review", "approval", "action required"})
+
 class GmailIntegration:
     """Gmail integration for notification and communication analysis"""
     
@@ -34,31 +54,59 @@ class GmailIntegration:
         self.trusted_domains = set(os.getenv("TRUSTED_DOMAINS", "").split(","))
         if self.company_domain:
             self.trusted_domains.add(self.company_domain)
-    
-    def _mint_access_token(self) -> str:
-        """Generate access token from refresh token"""
-        refresh = os.getenv("GMAIL_REFRESH_TOKEN")
-        cid = os.getenv("GMAIL_CLIENT_ID")
-        csec = os.getenv("GMAIL_CLIENT_SECRET")
         
-        if not all([refresh, cid, csec]):
-            raise RuntimeError("Missing env: GMAIL_REFRESH_TOKEN / GMAIL_CLIENT_ID / GMAIL_CLIENT_SECRET")
+        # Domain analysis only depends on configuration, so it is cached per
+        # domain in a size-capped LRU
+        self._domain_info: "OrderedDict[str, Dict]" = OrderedDict()
         
-        creds = Credentials(
-            None, 
-            refresh_token=refresh, 
-            token_uri="https://oauth2.googleapis.com/token",
-            client_id=cid, 
-            client_secret=csec, 
-            scopes=SCOPES
-        )
-        creds.refresh(Request())
-        return creds.token
+        # OAuth credentials are refreshed only once the access token expires,
+        # over a keep-alive session shared by all executor threads
+        self._creds: Optional[Credentials] = None
+        self._creds_lock = threading.Lock()
+        self._token_session = requests.Session()
+        
+        # httplib2 connections are not thread-safe, so each executor thread
+        # keeps its own service client and reuses its connection across calls
+        self._local = threading.local()
+        
+        self._api_semaphore = asyncio.Semaphore(MAX_CONCURRENT_API_CALLS)
+    
+    def _mint_access_token(self) -> str:
+        """Return a valid access token, refreshing it from the refresh token when expired"""
+        with self._creds_lock:
+            if self._creds is None:
+                refresh = os.getenv("GMAIL_REFRESH_TOKEN")
+                cid = os.getenv("GMAIL_CLIENT_ID")
+                csec = os.getenv("GMAIL_CLIENT_SECRET")
+                
+                if not all([refresh, cid, csec]):
+                    raise RuntimeError("Missing env: GMAIL_REFRESH_TOKEN / GMAIL_CLIENT_ID / GMAIL_CLIENT_SECRET")
+                
+                self._creds = Credentials(
+                    None, 
+                    refresh_token=refresh, 
+                    token_uri="https://oauth2.googleapis.com/token",
+                    client_id=cid, 
+                    client_secret=csec, 
+                    scopes=SCOPES
+                )
+            
+            if not self._creds.valid:
+                self._creds.refresh(Request(self._token_session))
+            return self._creds.token
     
     def _get_service(self, access_token: str):
-        """Get Gmail service client"""
-        creds = Credentials(token=access_token)
-        return build("gmail", "v1", credentials=creds, cache_discovery=False)
+        """Get this thread's Gmail service client, rebuilding it when the token changes"""
+        local = self._local
+        if getattr(local, "access_token", None) != access_token:
+            creds = Credentials(token=access_token)
+            local.service = build("gmail", "v1", credentials=creds, cache_discovery=False)
+            local.access_token = access_token
+        return local.service
+    
+    def close(self):
+        """Close the shared token refresh session"""
+        self._token_session.close()
     
     async def list_notifications(self, 
                                 since_iso: Optional[str] = None,
@@ -68,13 +116,14 @@ class GmailIntegration:
         
         # Run in thread pool since Gmail API is sync
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None, 
-            self._list_notifications_sync,
-            since_iso,
-            query, 
-            max_results
-        )
+        async with self._api_semaphore:
+            return await loop.run_in_executor(
+                None, 
+                self._list_notifications_sync,
+                since_iso,
+                query, 
+                max_results
+            )
     
     def _list_notifications_sync(self,
                                 since_iso: Optional[str] = None,
@@ -102,17 +151,14 @@ class GmailIntegration:
         ).execute()
         
         messages = result.get("messages", [])
+        metas = self._batch_get_metadata(service, [msg["id"] for msg in messages])
         notifications = []
         
         for msg in messages:
             try:
-                # Get message metadata
-                meta = service.users().messages().get(
-                    userId="me",
-                    id=msg["id"],
-                    format="metadata",
-                    metadataHeaders=["From", "To", "Subject", "Date"]
-                ).execute()
+                meta = metas.get(msg["id"])
+                if meta is None:
+                    continue
                 
                 headers = {
                     h["name"].lower(): h["value"] 
@@ -151,19 +197,58 @@ class GmailIntegration:
                 notifications.append(notification)
                 
             except Exception as e:
-                print(f"Error processing message {msg.get('id')}: {e}")
+                logger.warning("Error processing message %s: %s", msg.get("id"), e)
                 continue
         
         return notifications
     
+    def _batch_get_metadata(self, service, message_ids: List[str]) -> Dict[str, Dict]:
+        """Fetch message metadata for message_ids using batched HTTP requests, keyed by message id"""
+        metas = {}
+        
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                logger.warning("Error processing message %s: %s", request_id, exception)
+                return
+            metas[request_id] = response
+        
+        for start in range(0, len(message_ids), GMAIL_BATCH_SIZE):
+            chunk = message_ids[start:start + GMAIL_BATCH_SIZE]
+            batch = service.new_batch_http_request(callback=on_response)
+            for message_id in chunk:
+                batch.add(self._metadata_request(service, message_id), request_id=message_id)
+            
+            try:
+                batch.execute()
+            except HttpError as e:
+                # The batch endpoint itself failed; fetch this chunk one by one
+                logger.warning("Gmail batch request failed, falling back to single gets: %s", e)
+                for message_id in chunk:
+                    if message_id in metas:
+                        continue
+                    try:
+                        metas[message_id] = self._metadata_request(service, message_id).execute()
+                    except Exception as e:
+                        logger.warning("Error processing message %s: %s", message_id, e)
+        
+        return metas
+    
+    def _metadata_request(self, service, message_id: str):
+        """Build a messages.get request for notification metadata"""
+        return service.users().messages().get(
+            userId="me",
+            id=message_id,
+            format="metadata",
+            metadataHeaders=["From", "To", "Subject", "Date"]
+        )
+    
     def _determine_priority(self, headers: Dict[str, str]) -> str:
         """Determine message priority based on headers and content"""
         sender = headers.get("from", "").lower()
         subject = headers.get("subject", "").lower()
         
         # Check for urgent keywords
-        urgent_keywords = ["urgent", "asap", "emergency", "critical", "immediate"]
-        if any(keyword in subject for keyword in urgent_keywords):
+        if any(keyword in subject for keyword in URGENT_KEYWORDS):
             return "urgent"
         
         # Check if from company domain
@@ -171,8 +256,7 @@ class GmailIntegration:
             return "high"
         
         # Check for high priority keywords
-        high_keywords = ["deadline", "meeting", "review", "approval", "action required"]
-        if any(keyword in subject for keyword in high_keywords):
+        if any(keyword in subject for keyword in HIGH_KEYWORDS):
             return "high"
         
         return "medium"
@@ -183,12 +267,13 @@ class GmailIntegration:
         """Analyze sender importance based on communication history"""
         
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            self._analyze_sender_importance_sync,
-            sender_email,
-            days_back
-        )
+        async with self._api_semaphore:
+            return await loop.run_in_executor(
+                None,
+                self._analyze_sender_importance_sync,
+                sender_email,
+                days_back
+            )
     
     def _analyze_sender_importance_sync(self, 
                                       sender_email: str,
@@ -305,13 +390,14 @@ class GmailIntegration:
         """Get recent conversation history with a contact"""
         
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            self._get_recent_conversations_sync,
-            contact_email,
-            days_back,
-            max_messages
-        )
+        async with self._api_semaphore:
+            return await loop.run_in_executor(
+                None,
+                self._get_recent_conversations_sync,
+                contact_email,
+                days_back,
+                max_messages
+            )
     
     def _get_recent_conversations_sync(self,
                                      contact_email: str,
@@ -370,7 +456,7 @@ class GmailIntegration:
                     conversations.append(conversation)
                     
                 except Exception as e:
-                    print(f"Error processing conversation message {msg.get('id')}: {e}")
+                    logger.warning("Error processing conversation message %s: %s", msg.get("id"), e)
                     continue
             
             # Sort by timestamp (newest first)
@@ -378,17 +464,23 @@ class GmailIntegration:
             
             return conversations
             
-        except Exception as e:
-            print(f"Error getting conversations with {contact_email}: {e}")
+        except Exception:
+            logger.exception("Error getting conversations with %s", contact_email)
             return []
     
     async def check_sender_domain(self, sender_email: str) -> Dict:
         """Check sender domain information"""
         
         domain = sender_email.split("@")[-1] if "@" in sender_email else ""
-        result = self._analyze_domain(domain)
-        result["email"] = sender_email
-        return result
+        info = self._domain_info.get(domain)
+        if info is None:
+            info = self._analyze_domain(domain)
+            self._domain_info[domain] = info
+            if len(self._domain_info) > DOMAIN_INFO_CACHE_MAX_ENTRIES:
+                self._domain_info.popitem(last=False)
+        else:
+            self._domain_info.move_to_end(domain)
+        return {**info, "email": sender_email}
     
     def _analyze_domain(self, domain: str) -> Dict:
         """Analyze domain reputation and type"""
@@ -1,9 +1,16 @@
 # mcp-servers/communication-server/integrations/slack.py
 import os
+import re
+import sys
 import asyncio
+import bisect
+import heapq
+import logging
+import time
 import aiohttp
+import orjson
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, AsyncIterator, Tuple
 from pathlib import Path
 from collections import defaultdict, Counter
 
@@ -21,6 +28,46 @@ except ImportError:
 env_path = Path(__file__).parent.parent.parent.parent / ".env"
 load_dotenv(dotenv_path=env_path, override=True)
 
+logger = logging.getLogger(__name__)
+
+# Workspace metadata rarely changes, so team.info is cached per instance
+TEAM_INFO_TTL_SECONDS = 3600
+
+# How long the users.list snapshot is trusted before it is reloaded
+USERS_SNAPSHOT_TTL_SECONDS = 600
+
+# How long primed per-sender message counts are trusted
+SENDER_COUNTS_TTL_SECONDS = 300
+
+# search.messages page size, which also caps a sender's recent message count
+SENDER_SEARCH_LIMIT = 100
+HTTP_CONNECTION_LIMIT = 32
+
+# Slack requests in flight at once, to stay under the per-method rate limits
+MAX_CONCURRENT_API_CALLS = int(os.getenv("MCP_MAX_CONCURRENT_API_CALLS", "8"))
+
+# Limit notification fetches to this many channels to avoid rate limits
+MAX_NOTIFICATION_CHANNELS = 10
+
+# Priority keywords, matched as substrings of the lowercased message text
+URGENT_KEYWORDS = frozenset({"urgent", "asap", "emergency", "critical", "immediate", "help", "issue", "down", "broken"})
+HIGH_KEYWORDS = frozenset({"deadline", "meeting", "review", "approval", "action required", "fyi"})
+IMPORTANT_CHANNELS = frozenset({"alerts", "incidents", "urgent", "critical", "production", "ops"})
+
+def _keyword_pattern(keywords) -> str:
+    return "|".join(re.escape(keyword) for keyword in sorted(keywords))
+
+# Single-pass scan over the message text. The lookahead makes matches
+# zero-width so overlapping keywords are all reported, and the group name
+# tells us which tier matched.
+_PRIORITY_KEYWORDS_RE = re.compile(
+    f"(?=(?P<urgent>{_keyword_pattern(URGENT_KEYWORDS)})|(?P<high>{_keyword_pattern(HIGH_KEYWORDS)}))"
+)
+_IMPORTANT_CHANNELS_RE = re.compile(_keyword_pattern(IMPORTANT_CHANNELS))
+
+# Public (C), private/group (G) and DM (D) conversation ids
+_CHANNEL_ID_RE = re.compile(r"^[CDG][A-Z0-9]{8,}$")
+
 class SlackIntegration:
     """Slack integration for notification and communication analysis using user tokens"""
     
@@ -30,6 +77,39 @@ class SlackIntegration:
         
         if not self.user_token:
             raise RuntimeError("Missing env: SLACK_USER_TOKEN")
+        
+        self._team_info: Optional[Dict] = None
+        self._team_info_expires_at = 0.0
+        
+        # Workspace users indexed by ID, loaded from users.list
+        self._users_by_id: Optional[Dict[str, Dict]] = None
+        self._users_expires_at = 0.0
+        self._users_lock = asyncio.Lock()
+        
+        # Per-sender message counts from prime_sender_activity, keyed by window.
+        # The counts stay None when the scan was truncated by its page cap.
+        self._sender_counts: Optional[Counter] = None
+        self._sender_counts_days_back: Optional[int] = None
+        self._sender_counts_expires_at = 0.0
+        self._sender_counts_lock = asyncio.Lock()
+        
+        # Shared HTTP session, created on first use inside the running loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._api_semaphore = asyncio.Semaphore(MAX_CONCURRENT_API_CALLS)
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, reusing pooled keep-alive connections"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=HTTP_CONNECTION_LIMIT, keepalive_timeout=60)
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
     
     async def _make_api_call(self, endpoint: str, params: Dict[str, Any] = None) -> Dict:
         """Make authenticated API call to Slack using user token"""
@@ -40,19 +120,68 @@ class SlackIntegration:
         
         url = f"{self.base_url}/{endpoint}"
         
-        async with aiohttp.ClientSession() as session:
+        session = self._get_session()
+        async with self._api_semaphore:
             if params:
                 async with session.get(url, headers=headers, params=params) as response:
-                    data = await response.json()
+                    data = orjson.loads(await response.read())
             else:
                 async with session.get(url, headers=headers) as response:
-                    data = await response.json()
+                    data = orjson.loads(await response.read())
         
         if not data.get("ok"):
             raise RuntimeError(f"Slack API error: {data.get('error', 'Unknown error')}")
         
         return data
     
+    async def _get_team_info(self) -> Dict:
+        """Get workspace info, served from cache while it is fresh"""
+        if self._team_info is None or time.monotonic() >= self._team_info_expires_at:
+            team_data = await self._make_api_call("team.info")
+            self._team_info = team_data.get("team", {})
+            self._team_info_expires_at = time.monotonic() + TEAM_INFO_TTL_SECONDS
+        return self._team_info
+    
+    async def _load_users_snapshot(self) -> Dict[str, Dict]:
+        """Page through users.list and index the workspace's users by ID"""
+        users_by_id = {}
+        params = {"limit": 200}
+        
+        try:
+            while True:
+                users_data = await self._make_api_call("users.list", params)
+                for user in users_data.get("members", []):
+                    users_by_id[user["id"]] = user
+                
+                cursor = users_data.get("response_metadata", {}).get("next_cursor")
+                if not cursor:
+                    break
+                params = {"limit": 200, "cursor": cursor}
+        except Exception:
+            # Without a snapshot every lookup falls back to users.info
+            logger.warning("Could not load Slack users snapshot", exc_info=True)
+        
+        self._users_by_id = users_by_id
+        self._users_expires_at = time.monotonic() + USERS_SNAPSHOT_TTL_SECONDS
+        return users_by_id
+    
+    async def _get_user_info(self, user_id: str) -> Dict:
+        """Resolve a user from the workspace snapshot, calling users.info on a miss"""
+        if self._users_by_id is None or time.monotonic() >= self._users_expires_at:
+            # Concurrent lookups on a cold snapshot wait for one users.list load
+            async with self._users_lock:
+                if self._users_by_id is None or time.monotonic() >= self._users_expires_at:
+                    await self._load_users_snapshot()
+        
+        user_info = self._users_by_id.get(user_id)
+        if user_info is None:
+            user_data = await self._make_api_call("users.info", {"user": user_id})
+            user_info = user_data.get("user", {})
+            # Patch the snapshot so the next lookup for this user is local
+            self._users_by_id[user_id] = user_info
+        
+        return user_info
+    
     async def list_notifications(self,
                                 since_timestamp: Optional[str] = None,
                                 channel_filter: Optional[str] = None,
@@ -60,135 +189,297 @@ class SlackIntegration:
         """List recent Slack notifications/messages with filters"""
         
         try:
-            # Get list of channels first
-            channels_data = await self._make_api_call("conversations.list", {
-                "types": "public_channel,private_channel,im,mpim",
-                "exclude_archived": "true",
-                "limit": 100
-            })
-            
-            channels = channels_data.get("channels", [])
+            # Keep only the newest max_results in a bounded min-heap instead of
+            # collecting and sorting everything fetched. The negated index keeps
+            # the order stable for messages sharing a timestamp.
+            newest = []
+            index = 0
+            async for ts, notification in self._iter_notifications(since_timestamp, channel_filter, max_results):
+                entry = (ts, -index, notification)
+                if len(newest) < max_results:
+                    heapq.heappush(newest, entry)
+                else:
+                    heapq.heappushpop(newest, entry)
+                index += 1
+            
+            # Sort by timestamp (newest first) and only build created_at for
+            # the notifications actually returned
             notifications = []
+            for ts, _, notification in sorted(newest, reverse=True):
+                notification["created_at"] = datetime.fromtimestamp(ts).isoformat()
+                notifications.append(notification)
             
-            # Calculate since timestamp
-            since_ts = None
-            if since_timestamp:
-                try:
-                    dt = datetime.fromisoformat(since_timestamp.replace("Z", "+00:00"))
-                    since_ts = str(dt.timestamp())
-                except Exception:
-                    # Default to 1 day ago if parsing fails
-                    since_ts = str((datetime.now() - timedelta(days=1)).timestamp())
-            else:
-                since_ts = str((datetime.now() - timedelta(days=1)).timestamp())
-            
-            # Filter channels if specified
-            if channel_filter:
-                channels = [ch for ch in channels if channel_filter.lower() in ch.get("name", "").lower()]
+            return notifications
             
-            # Get messages from channels
-            for channel in channels[:10]:  # Limit to first 10 channels to avoid rate limits
-                try:
-                    messages_data = await self._make_api_call("conversations.history", {
-                        "channel": channel["id"],
-                        "oldest": since_ts,
-                        "limit": max_results // len(channels[:10]) + 1
-                    })
+        except Exception:
+            logger.exception("Error fetching Slack notifications")
+            return []
+    
+    async def _iter_notifications(self,
+                                  since_timestamp: Optional[str],
+                                  channel_filter: Optional[str],
+                                  max_results: int) -> AsyncIterator[Tuple[float, Dict]]:
+        """Yield (ts, notification) pairs channel by channel, stopping after max_results.
+        
+        ts is the message's Slack timestamp in Unix seconds; created_at is
+        left for the caller to fill in.
+        """
+        
+        # Get list of channels first
+        channels = await self._select_channels(channel_filter, MAX_NOTIFICATION_CHANNELS)
+        yielded = 0
+        
+        # Calculate since timestamp, defaulting to 1 day ago if missing or unparsable
+        since_ts = None
+        if since_timestamp:
+            try:
+                dt = datetime.fromisoformat(since_timestamp.replace("Z", "+00:00"))
+                since_ts = str(dt.timestamp())
+            except Exception:
+                pass
+        if since_ts is None:
+            since_ts = str(time.time() - 86400)
+        
+        # Spread the budget across channels so one busy channel does not
+        # crowd out the rest
+        if not channels:
+            return
+        channel_budget = max_results // len(channels) + 1
+        
+        # First history pages for every channel are requested concurrently, so
+        # a cycle costs one round trip instead of one per channel
+        history_params = [
+            {"channel": channel["id"], "oldest": since_ts, "limit": channel_budget}
+            for channel in channels
+        ]
+        first_pages = await asyncio.gather(
+            *(self._make_api_call("conversations.history", params) for params in history_params),
+            return_exceptions=True
+        )
+        
+        # Get messages from channels
+        for channel, params, first_page in zip(channels, history_params, first_pages):
+            try:
+                if isinstance(first_page, BaseException):
+                    raise first_page
+                
+                # Strings that only depend on the channel are built once
+                channel_id = channel["id"]
+                # Decoded JSON yields a fresh string per occurrence; interning
+                # lets every notification share one copy of repeated values
+                channel_name = sys.intern(channel.get("name", ""))
+                title = f"Message in #{channel.get('name', 'unknown')}"
+                recipient = f"#{channel.get('name', 'unknown')}"
+                channel_type = channel.get("is_private", False) and "private" or "public"
+                link_prefix = f"https://app.slack.com/client/{channel.get('team_id', '')}/{channel_id}/thread/"
+                
+                channel_yielded = 0
+                
+                # Follow next_cursor only while this channel still has budget,
+                # so filtered-out messages do not leave it under-fetched
+                messages_data = first_page
+                while True:
                     
-                    messages = messages_data.get("messages", [])
+                    # Skip bot messages and system messages, and anything past the budget
+                    messages = [
+                        msg for msg in messages_data.get("messages", [])
+                        if msg.get("subtype") not in ["bot_message", "channel_join", "channel_leave"]
+                    ][:min(channel_budget - channel_yielded, max_results - yielded)]
+                    priorities = self._determine_priorities_batch(messages, channel)
                     
-                    for msg in messages:
-                        # Skip bot messages and system messages
-                        if msg.get("subtype") in ["bot_message", "channel_join", "channel_leave"]:
-                            continue
-                        
+                    for msg, priority in zip(messages, priorities):
                         # Get user info
                         user_info = {}
                         if msg.get("user"):
                             try:
-                                user_data = await self._make_api_call("users.info", {"user": msg["user"]})
-                                user_info = user_data.get("user", {})
+                                user_info = await self._get_user_info(msg["user"])
                             except:
                                 user_info = {"real_name": "Unknown User", "profile": {"email": ""}}
                         
-                        # Convert timestamp to ISO format string
+                        # Slack ts is already Unix seconds
                         try:
-                            created_at = datetime.fromtimestamp(float(msg.get("ts", "0"))).isoformat()
+                            ts = float(msg.get("ts", "0"))
                         except (ValueError, TypeError):
-                            created_at = datetime.now().isoformat()
+                            ts = time.time()
+                        
+                        sender_id = sys.intern(msg.get("user", ""))
                         
                         # Build notification object
-                        notification = {
+                        yield ts, {
                             "id": f"slack:{msg.get('ts', '')}",
                             "external_id": msg.get("ts", ""),
                             "thread_id": msg.get("thread_ts", ""),
                             "platform": "slack",
                             "notification_type": "message",
-                            "title": f"Message in #{channel.get('name', 'unknown')}",
+                            "title": title,
                             "content": msg.get("text", ""),
                             "sender": user_info.get("real_name", "Unknown User"),
-                            "sender_id": msg.get("user", ""),
-                            "recipient": f"#{channel.get('name', 'unknown')}",
-                            "priority": self._determine_priority(msg, channel, user_info),
+                            "sender_id": sender_id,
+                            "recipient": recipient,
+                            "priority": priority,
                             "metadata": {
-                                "channel_id": channel["id"],
-                                "channel_name": channel.get("name", ""),
-                                "channel_type": channel.get("is_private", False) and "private" or "public",
+                                "channel_id": channel_id,
+                                "channel_name": channel_name,
+                                "channel_type": channel_type,
                                 "thread_ts": msg.get("thread_ts", ""),
                                 "is_thread_reply": bool(msg.get("thread_ts")),
                                 "reaction_count": len(msg.get("reactions", [])),
                                 "reply_count": msg.get("reply_count", 0)
                             },
-                            "created_at": created_at,
-                            "link": f"https://app.slack.com/client/{channel.get('team_id', '')}/{channel['id']}/thread/{msg.get('ts', '')}"
+                            "link": link_prefix + msg.get("ts", "")
                         }
-                        
-                        notifications.append(notification)
-                        
-                        if len(notifications) >= max_results:
-                            break
+                        yielded += 1
+                        channel_yielded += 1
                     
-                except Exception as e:
-                    print(f"Error processing channel {channel.get('name')}: {e}")
-                    continue
+                    cursor = messages_data.get("response_metadata", {}).get("next_cursor")
+                    if not cursor or channel_yielded >= channel_budget or yielded >= max_results:
+                        break
+                    params = {**params, "cursor": cursor}
+                    messages_data = await self._make_api_call("conversations.history", params)
                 
-                if len(notifications) >= max_results:
-                    break
-            
-            # Sort by timestamp (newest first)
-            notifications.sort(key=lambda x: x["created_at"], reverse=True)
-            
-            return notifications[:max_results]
+            except Exception:
+                logger.exception("Error processing channel %s", channel.get("name"))
+                continue
             
-        except Exception as e:
-            print(f"Error fetching Slack notifications: {e}")
-            return []
+            if yielded >= max_results:
+                break
+    
+    async def _select_channels(self, channel_filter: Optional[str], limit: int) -> List[Dict]:
+        """Return up to limit channels matching channel_filter (a name substring or channel id)"""
+        
+        # A channel id needs no listing at all. Upper-case names look like ids
+        # too, so anything conversations.info does not resolve is matched by name.
+        if channel_filter and _CHANNEL_ID_RE.match(channel_filter):
+            try:
+                channel_data = await self._make_api_call("conversations.info", {"channel": channel_filter})
+            except RuntimeError:
+                channel_data = {}
+            if channel_data.get("channel"):
+                return [channel_data["channel"]]
+        
+        needle = channel_filter.lower() if channel_filter else None
+        matched = []
+        params = {
+            "types": "public_channel,private_channel,im,mpim",
+            "exclude_archived": "true",
+            "limit": 100 if needle is None else 200
+        }
+        
+        # Page through conversations.list and stop as soon as enough channels match
+        while True:
+            channels_data = await self._make_api_call("conversations.list", params)
+            for channel in channels_data.get("channels", []):
+                if needle is None or needle in channel.get("name", "").lower():
+                    matched.append(channel)
+                    if len(matched) >= limit:
+                        return matched
+            
+            # Without a filter the first page is enough, as before
+            cursor = channels_data.get("response_metadata", {}).get("next_cursor")
+            if needle is None or not cursor:
+                return matched
+            params = {**params, "cursor": cursor}
     
     def _determine_priority(self, message: Dict, channel: Dict, user_info: Dict) -> str:
         """Determine message priority based on content and context"""
-        text = message.get("text", "").lower()
-        channel_name = channel.get("name", "").lower()
+        return self._determine_priorities_batch([message], channel)[0]
+    
+    def _determine_priorities_batch(self, messages: List[Dict], channel: Dict) -> List[str]:
+        """Determine priorities for messages from one channel with a single regex scan"""
+        texts = [message.get("text", "").lower() for message in messages]
+        
+        # Scan all texts joined by a separator no keyword contains, then map
+        # each match back to its message by offset. Urgent beats high.
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+        
+        keyword_tiers = [None] * len(texts)
+        for match in _PRIORITY_KEYWORDS_RE.finditer("\0".join(texts)):
+            index = bisect.bisect_right(starts, match.start()) - 1
+            if keyword_tiers[index] != "urgent":
+                keyword_tiers[index] = match.lastgroup
+        
+        # Channel-level signals are the same for every message in the batch
+        is_im = channel.get("is_im")
+        is_important_channel = bool(_IMPORTANT_CHANNELS_RE.search(channel.get("name", "").lower()))
+        
+        priorities = []
+        for text, keyword_tier in zip(texts, keyword_tiers):
+            # Check for urgent keywords
+            if keyword_tier == "urgent":
+                priorities.append("urgent")
+            # Check if it's a direct mention or DM
+            elif is_im or "@channel" in text or "@here" in text:
+                priorities.append("high")
+            # Check for important channels
+            elif is_important_channel:
+                priorities.append("high")
+            # Check for high priority keywords
+            elif keyword_tier == "high":
+                priorities.append("high")
+            else:
+                priorities.append("medium")
+        
+        return priorities
+    
+    async def prime_sender_activity(self, days_back: int = 30, max_pages: int = 10) -> Optional[Counter]:
+        """Count recent messages per sender with one paged search.
         
-        # Check for urgent keywords
-        urgent_keywords = ["urgent", "asap", "emergency", "critical", "immediate", "help", "issue", "down", "broken"]
-        if any(keyword in text for keyword in urgent_keywords):
-            return "urgent"
+        Later analyze_sender_importance calls with the same days_back read
+        their message count from this snapshot instead of searching per sender.
+        Counts are capped at SENDER_SEARCH_LIMIT like the per-sender search.
+        If the search has more than max_pages pages, paging stops after the
+        first one and no counts are kept, so those calls search per sender.
+        """
+        since_ts = str((datetime.now() - timedelta(days=days_back)).timestamp())
+        counts = Counter()
+        page = 1
         
-        # Check if it's a direct mention or DM
-        if channel.get("is_im") or "@channel" in text or "@here" in text:
-            return "high"
+        while True:
+            search_data = await self._make_api_call("search.messages", {
+                "query": f"after:{since_ts}",
+                "count": SENDER_SEARCH_LIMIT,
+                "page": page
+            })
+            
+            messages = search_data.get("messages", {})
+            total_pages = messages.get("paging", {}).get("pages", 1)
+            if total_pages > max_pages:
+                logger.info("Sender activity spans %d pages, using per-sender search", total_pages)
+                counts = None
+                break
+            
+            counts.update(
+                match["user"] for match in messages.get("matches", []) if match.get("user")
+            )
+            if page >= total_pages:
+                break
+            page += 1
         
-        # Check for important channels
-        important_channels = ["alerts", "incidents", "urgent", "critical", "production", "ops"]
-        if any(keyword in channel_name for keyword in important_channels):
-            return "high"
+        if counts is not None:
+            counts = Counter({user: min(count, SENDER_SEARCH_LIMIT) for user, count in counts.items()})
         
-        # Check for high priority keywords
-        high_keywords = ["deadline", "meeting", "review", "approval", "action required", "fyi"]
-        if any(keyword in text for keyword in high_keywords):
-            return "high"
+        self._sender_counts = counts
+        self._sender_counts_days_back = days_back
+        self._sender_counts_expires_at = time.monotonic() + SENDER_COUNTS_TTL_SECONDS
+        return counts
+    
+    async def ensure_sender_activity(self, days_back: int = 30):
+        """Prime sender counts for days_back unless a fresh snapshot exists.
         
-        return "medium"
+        Concurrent callers wait for a single prime instead of starting their own.
+        """
+        async with self._sender_counts_lock:
+            if not self.sender_activity_primed(days_back):
+                await self.prime_sender_activity(days_back)
+    
+    def sender_activity_primed(self, days_back: int) -> bool:
+        """Whether prime_sender_activity ran for this window and has not expired"""
+        return (self._sender_counts_days_back == days_back
+                and time.monotonic() < self._sender_counts_expires_at)
     
     async def analyze_sender_importance(self,
                                       sender_id: str,
@@ -197,20 +488,24 @@ class SlackIntegration:
         
         try:
             # Get user info
-            user_data = await self._make_api_call("users.info", {"user": sender_id})
-            user_info = user_data.get("user", {})
-            
-            # Get user's message activity across channels
-            since_ts = str((datetime.now() - timedelta(days=days_back)).timestamp())
-            
-            # Search for messages from this user
-            search_data = await self._make_api_call("search.messages", {
-                "query": f"from:{sender_id} after:{since_ts}",
-                "count": 100
-            })
-            
-            messages = search_data.get("messages", {}).get("matches", [])
-            message_count = len(messages)
+            user_info = await self._get_user_info(sender_id)
+            
+            # Use primed activity counts when available for this window,
+            # otherwise search for messages from this user
+            if (self._sender_counts is not None
+                    and self.sender_activity_primed(days_back)
+                    and sender_id in self._sender_counts):
+                message_count = self._sender_counts[sender_id]
+            else:
+                since_ts = str((datetime.now() - timedelta(days=days_back)).timestamp())
+                
+                search_data = await self._make_api_call("search.messages", {
+                    "query": f"from:{sender_id} after:{since_ts}",
+                    "count": SENDER_SEARCH_LIMIT
+                })
+                
+                messages = search_data.get("messages", {}).get("matches", [])
+                message_count = len(messages)
             
             # Analyze user profile
             profile = user_info.get("profile", {})
@@ -315,8 +610,8 @@ class SlackIntegration:
                 sender_name = "Unknown User"
                 if msg.get("user"):
                     try:
-                        user_data = await self._make_api_call("users.info", {"user": msg["user"]})
-                        sender_name = user_data.get("user", {}).get("real_name", "Unknown User")
+                        user_info = await self._get_user_info(msg["user"])
+                        sender_name = user_info.get("real_name", "Unknown User")
                     except:
                         pass
                 
@@ -344,20 +639,19 @@ class SlackIntegration:
             
             return conversations
             
-        except Exception as e:
-            print(f"Error getting conversations with user {user_id}: {e}")
+        except Exception:
+            logger.exception("Error getting conversations with user %s", user_id)
             return []
     
     async def check_user_workspace(self, user_id: str) -> Dict:
         """Check user workspace information and permissions"""
         
         try:
-            user_data = await self._make_api_call("users.info", {"user": user_id})
-            user_info = user_data.get("user", {})
-            
-            # Get team info
-            team_data = await self._make_api_call("team.info")
-            team_info = team_data.get("team", {})
+            # User and team lookups are independent, so issue them together
+            user_info, team_info = await asyncio.gather(
+                self._get_user_info(user_id),
+                self._get_team_info()
+            )
             
             # Determine user type
             user_type = "unknown"
@@ -400,14 +694,13 @@ class SlackIntegration:
         """Get detailed information about a Slack channel"""
         
         try:
-            channel_data = await self._make_api_call("conversations.info", {"channel": channel_id})
-            channel = channel_data.get("channel", {})
-            
-            # Get member count
-            members_data = await self._make_api_call("conversations.members", {
+            # include_num_members returns the member count with the channel,
+            # so no separate conversations.members call is needed
+            channel_data = await self._make_api_call("conversations.info", {
                 "channel": channel_id,
-                "limit": 1
+                "include_num_members": "true"
             })
+            channel = channel_data.get("channel", {})
             
             return {
                 "channel_id": channel_id,
@@ -416,7 +709,7 @@ class SlackIntegration:
                 "purpose": channel.get("purpose", {}).get("value", ""),
                 "is_private": channel.get("is_private", False),
                 "is_archived": channel.get("is_archived", False),
-                "member_count": len(members_data.get("members", [])),
+                "member_count": channel.get("num_members", 0),
                 "created": datetime.fromtimestamp(channel.get("created", 0)).isoformat() if channel.get("created", 0) else datetime.now().isoformat(),
                 "creator": channel.get("creator", "")
             }
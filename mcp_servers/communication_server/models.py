@@ -59,6 +59,10 @@ class SlackListNotificationsArgs(BaseModel):
     channel_filter: Optional[str] = None
     max_results: int = Field(default=20, ge=1, le=100)
 
+class ListAllNotificationsArgs(BaseModel):
+    since: Optional[str] = None
+    max_results: int = Field(default=20, ge=1, le=100)
+
 class SlackUserInfo(BaseModel):
     user_id: str
     user_name: str
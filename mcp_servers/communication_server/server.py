@@ -1,8 +1,12 @@
 # mcp-servers/communication-server/server.py
 import asyncio
-import json
 import logging
-from typing import Dict, List, Any
+import os
+import time
+import orjson
+from datetime import date
+from pydantic import TypeAdapter
+from typing import Dict, List, Any, Awaitable, Callable
 from mcp.server import Server
 from mcp.types import Tool, TextContent
 from mcp.server.stdio import stdio_server
@@ -11,7 +15,8 @@ from mcp.server.lowlevel import NotificationOptions
 
 try:
     # Try relative imports first (when run as module)
-    from .models import Notification, ListNotificationsArgs, SlackListNotificationsArgs
+    from ..common import JsonResults, configure_logging
+    from .models import Notification, ListNotificationsArgs, SlackListNotificationsArgs, ListAllNotificationsArgs
     from .integrations.gmail import GmailIntegration
     from .integrations.slack import SlackIntegration
 except ImportError:
@@ -19,419 +24,576 @@ except ImportError:
     import sys
     from pathlib import Path
     sys.path.append(str(Path(__file__).parent.parent.parent))
-    from mcp_servers.communication_server.models import Notification, ListNotificationsArgs, SlackListNotificationsArgs
+    from mcp_servers.common import JsonResults, configure_logging
+    from mcp_servers.communication_server.models import Notification, ListNotificationsArgs, SlackListNotificationsArgs, ListAllNotificationsArgs
     from mcp_servers.communication_server.integrations.gmail import GmailIntegration
     from mcp_servers.communication_server.integrations.slack import SlackIntegration
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Log records go to stderr through a queue; stdout carries the JSON-RPC stream
+configure_logging(logging.WARNING)
 logger = logging.getLogger(__name__)
 
+def _dumps(obj: Any) -> str:
+    """Serialize a tool response to JSON text; orjson emits UTF-8 and handles datetimes natively"""
+    return orjson.dumps(obj, default=str).decode()
+
+# Sender and user lookups are stable for hours, so their results are cached
+# per (tool, arguments, day) for MCP_CACHE_TTL seconds
+CACHE_TTL_SECONDS = float(os.getenv("MCP_CACHE_TTL", "3600"))
+CACHE_MAX_ENTRIES = 1024
+_tool_cache: Dict[tuple, tuple] = {}
+
+# Concurrent identical fetches share one in-flight task. Outbound Gmail and
+# Slack calls are capped by the integrations around each request.
+_inflight: Dict[tuple, asyncio.Task] = {}
+
+async def _singleflight(key: tuple, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """Run fetch, sharing the result with concurrent callers for key"""
+    task = _inflight.get(key)
+    if task is None:
+        async def run():
+            try:
+                return await fetch()
+            finally:
+                _inflight.pop(key, None)
+        
+        task = asyncio.ensure_future(run())
+        _inflight[key] = task
+    
+    # Shield the shared task so one cancelled caller does not cancel the others
+    return await asyncio.shield(task)
+
+# Gmail list requests with the same filters that arrive within this window
+# are merged into one fetch at the largest max_results. Gmail lists newest
+# first, so each caller's result is a prefix of the merged one.
+GMAIL_BATCH_WINDOW_SECONDS = float(os.getenv("MCP_GMAIL_BATCH_WINDOW_MS", "20")) / 1000
+_gmail_batches: Dict[tuple, Dict[str, Any]] = {}
+
+async def _flush_gmail_batch(key: tuple, batch: Dict[str, Any]):
+    """Wait out the batching window, then fetch once for every caller in the batch"""
+    await asyncio.sleep(GMAIL_BATCH_WINDOW_SECONDS)
+    _gmail_batches.pop(key, None)
+    since, query = key
+    max_results = batch["max_results"]
+    try:
+        notifications = await _singleflight(
+            ("list_gmail_notifications", since, query, max_results),
+            lambda: gmail_integration.list_notifications(
+                since_iso=since,
+                query=query,
+                max_results=max_results
+            )
+        )
+    except Exception as e:
+        batch["future"].set_exception(e)
+    else:
+        batch["future"].set_result(notifications)
+
+async def _batched_gmail_notifications(since: Any, query: Any, max_results: int) -> List[Dict]:
+    """List Gmail notifications, sharing one fetch with compatible requests in the window"""
+    key = (since, query)
+    batch = _gmail_batches.get(key)
+    if batch is None:
+        batch = {"max_results": max_results, "future": asyncio.get_running_loop().create_future()}
+        batch["task"] = asyncio.ensure_future(_flush_gmail_batch(key, batch))
+        _gmail_batches[key] = batch
+    else:
+        batch["max_results"] = max(batch["max_results"], max_results)
+    
+    notifications = await asyncio.shield(batch["future"])
+    return notifications[:max_results]
+
+async def _cached(key: tuple, fetch: Callable[[], Awaitable[Dict]]) -> Dict:
+    """Return a cached lookup result for key, calling fetch on a miss or expiry"""
+    key = (*key, date.today())
+    now = time.monotonic()
+    entry = _tool_cache.get(key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+    
+    result = await _singleflight(key, fetch)
+    
+    # Integrations return a fallback dict on failure; do not pin those
+    if "error" in result or str(result.get("context", "")).startswith("Error"):
+        return result
+    
+    _tool_cache.pop(key, None)
+    if len(_tool_cache) >= CACHE_MAX_ENTRIES:
+        del _tool_cache[next(iter(_tool_cache))]
+    _tool_cache[key] = (now + CACHE_TTL_SECONDS, result)
+    return result
+
 # Initialize MCP server
-print("🚀 Starting MCP Communication Server...")
 server = Server("communication-server")
-print("✅ MCP Server instance created")
 
 # Initialize integrations
-print("🔧 Initializing Gmail integration...")
 gmail_integration = GmailIntegration()
-print("✅ Gmail integration initialized")
+logger.debug("Gmail integration initialized")
 
-print("🔧 Initializing Slack integration...")
 try:
     slack_integration = SlackIntegration()
-    print("✅ Slack integration initialized (user token)")
+    logger.debug("Slack integration initialized (user token)")
 except Exception as e:
-    print(f"⚠️ Slack integration failed to initialize: {e}")
-    print("💡 Add SLACK_USER_TOKEN to .env file to enable Slack integration")
+    logger.warning(f"Slack integration failed to initialize: {e}. "
+                   "Add SLACK_USER_TOKEN to .env file to enable Slack integration")
     slack_integration = None
 
-@server.list_tools()
-async def list_tools() -> List[Tool]:
-    """List available tools for communication platforms"""
-    print("📋 Client requested tool list")
-    return [
-        Tool(
-            name="list_gmail_notifications",
-            description="List recent Gmail notifications from INBOX with optional filters",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "since": {
-                        "type": "string",
-                        "description": "ISO-8601 timestamp to filter notifications since this date"
-                    },
-                    "query": {
-                        "type": "string", 
-                        "description": "Gmail search query (e.g., 'from:example@company.com')"
-                    },
-                    "max_results": {
-                        "type": "integer",
-                        "description": "Maximum number of notifications to return",
-                        "default": 20
-                    }
+# Tool definitions are static, so they are built once and shared by every
+# tools/list request
+_TOOLS = [
+    Tool(
+        name="list_gmail_notifications",
+        description="List recent Gmail notifications from INBOX with optional filters",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "since": {
+                    "type": "string",
+                    "description": "ISO-8601 timestamp to filter notifications since this date"
+                },
+                "query": {
+                    "type": "string", 
+                    "description": "Gmail search query (e.g., 'from:example@company.com')"
+                },
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum number of notifications to return",
+                    "default": 20
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="analyze_sender_importance",
+        description="Analyze the importance of an email sender based on communication history",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "sender_email": {
+                    "type": "string",
+                    "description": "Email address of the sender to analyze"
                 },
-                "required": []
-            }
-        ),
-        Tool(
-            name="analyze_sender_importance",
-            description="Analyze the importance of an email sender based on communication history",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "sender_email": {
-                        "type": "string",
-                        "description": "Email address of the sender to analyze"
-                    },
-                    "days_back": {
-                        "type": "integer", 
-                        "description": "Number of days to look back for analysis",
-                        "default": 30
-                    }
+                "days_back": {
+                    "type": "integer", 
+                    "description": "Number of days to look back for analysis",
+                    "default": 30
+                }
+            },
+            "required": ["sender_email"]
+        }
+    ),
+    Tool(
+        name="get_recent_conversations",
+        description="Get recent conversation history with a specific contact",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "contact_email": {
+                    "type": "string",
+                    "description": "Email address of the contact"
                 },
-                "required": ["sender_email"]
-            }
-        ),
-        Tool(
-            name="get_recent_conversations",
-            description="Get recent conversation history with a specific contact",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "contact_email": {
-                        "type": "string",
-                        "description": "Email address of the contact"
-                    },
-                    "days_back": {
-                        "type": "integer",
-                        "description": "Number of days to look back",
-                        "default": 7
-                    },
-                    "max_messages": {
-                        "type": "integer",
-                        "description": "Maximum number of messages to return",
-                        "default": 10
-                    }
+                "days_back": {
+                    "type": "integer",
+                    "description": "Number of days to look back",
+                    "default": 7
                 },
-                "required": ["contact_email"]
-            }
-        ),
-        Tool(
-            name="check_sender_domain",
-            description="Check if sender is from company domain or external",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "sender_email": {
-                        "type": "string",
-                        "description": "Email address to check domain for"
-                    }
+                "max_messages": {
+                    "type": "integer",
+                    "description": "Maximum number of messages to return",
+                    "default": 10
+                }
+            },
+            "required": ["contact_email"]
+        }
+    ),
+    Tool(
+        name="check_sender_domain",
+        description="Check if sender is from company domain or external",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "sender_email": {
+                    "type": "string",
+                    "description": "Email address to check domain for"
+                }
+            },
+            "required": ["sender_email"]
+        }
+    ),
+    # Slack tools
+    Tool(
+        name="list_slack_notifications",
+        description="List recent Slack messages/notifications with optional filters",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "since_timestamp": {
+                    "type": "string",
+                    "description": "ISO-8601 timestamp to filter messages since this date"
                 },
-                "required": ["sender_email"]
-            }
-        ),
-        # Slack tools
-        Tool(
-            name="list_slack_notifications",
-            description="List recent Slack messages/notifications with optional filters",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "since_timestamp": {
-                        "type": "string",
-                        "description": "ISO-8601 timestamp to filter messages since this date"
-                    },
-                    "channel_filter": {
-                        "type": "string",
-                        "description": "Filter messages by channel name (partial match)"
-                    },
-                    "max_results": {
-                        "type": "integer",
-                        "description": "Maximum number of messages to return",
-                        "default": 20
-                    }
+                "channel_filter": {
+                    "type": "string",
+                    "description": "Filter messages by channel ID (e.g. C012AB3CD) or by channel name (case-insensitive partial match)"
                 },
-                "required": []
-            }
-        ),
-        Tool(
-            name="analyze_slack_user_importance",
-            description="Analyze the importance of a Slack user based on communication history and role",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "user_id": {
-                        "type": "string",
-                        "description": "Slack user ID to analyze"
-                    },
-                    "days_back": {
-                        "type": "integer",
-                        "description": "Number of days to look back for analysis",
-                        "default": 30
-                    }
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum number of messages to return",
+                    "default": 20
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="analyze_slack_user_importance",
+        description="Analyze the importance of a Slack user based on communication history and role",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "user_id": {
+                    "type": "string",
+                    "description": "Slack user ID to analyze"
                 },
-                "required": ["user_id"]
-            }
-        ),
-        Tool(
-            name="get_slack_conversations",
-            description="Get recent conversation history with a specific Slack user",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "user_id": {
-                        "type": "string",
-                        "description": "Slack user ID to get conversations with"
-                    },
-                    "days_back": {
-                        "type": "integer",
-                        "description": "Number of days to look back",
-                        "default": 7
-                    },
-                    "max_messages": {
-                        "type": "integer",
-                        "description": "Maximum number of messages to return",
-                        "default": 10
-                    }
+                "days_back": {
+                    "type": "integer",
+                    "description": "Number of days to look back for analysis",
+                    "default": 30
+                }
+            },
+            "required": ["user_id"]
+        }
+    ),
+    Tool(
+        name="get_slack_conversations",
+        description="Get recent conversation history with a specific Slack user",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "user_id": {
+                    "type": "string",
+                    "description": "Slack user ID to get conversations with"
                 },
-                "required": ["user_id"]
-            }
-        ),
-        Tool(
-            name="check_slack_user_workspace",
-            description="Check Slack user workspace information and permissions",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "user_id": {
-                        "type": "string",
-                        "description": "Slack user ID to check"
-                    }
+                "days_back": {
+                    "type": "integer",
+                    "description": "Number of days to look back",
+                    "default": 7
                 },
-                "required": ["user_id"]
-            }
-        ),
-        Tool(
-            name="get_slack_channel_info",
-            description="Get detailed information about a Slack channel",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "channel_id": {
-                        "type": "string",
-                        "description": "Slack channel ID to get information for"
-                    }
+                "max_messages": {
+                    "type": "integer",
+                    "description": "Maximum number of messages to return",
+                    "default": 10
+                }
+            },
+            "required": ["user_id"]
+        }
+    ),
+    Tool(
+        name="check_slack_user_workspace",
+        description="Check Slack user workspace information and permissions",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "user_id": {
+                    "type": "string",
+                    "description": "Slack user ID to check"
+                }
+            },
+            "required": ["user_id"]
+        }
+    ),
+    Tool(
+        name="get_slack_channel_info",
+        description="Get detailed information about a Slack channel",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "channel_id": {
+                    "type": "string",
+                    "description": "Slack channel ID to get information for"
+                }
+            },
+            "required": ["channel_id"]
+        }
+    ),
+    Tool(
+        name="list_all_notifications",
+        description="List recent Gmail and Slack notifications together, fetched concurrently",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "since": {
+                    "type": "string",
+                    "description": "ISO-8601 timestamp to filter notifications since this date"
                 },
-                "required": ["channel_id"]
-            }
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum number of notifications to return per platform",
+                    "default": 20
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="flush_cache",
+        description="Clear cached sender importance and Slack workspace lookups",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    )
+]
+
+@server.list_tools()
+async def list_tools() -> List[Tool]:
+    """List available tools for communication platforms"""
+    logger.debug("Client requested tool list")
+    return _TOOLS
+
+# Argument validators are compiled once instead of on every call
+_LIST_ARGS = TypeAdapter(ListNotificationsArgs)
+_SLACK_LIST_ARGS = TypeAdapter(SlackListNotificationsArgs)
+_LIST_ALL_ARGS = TypeAdapter(ListAllNotificationsArgs)
+
+# Larger notifications lists are serialized in a worker thread
+_results = JsonResults(_dumps, "notifications", offload_threshold=100)
+_wrap_json = _results.wrap_json
+_wrap_result = _results.wrap_result
+
+# Gmail tools
+async def _list_gmail_notifications(arguments: dict) -> Dict:
+    # Validate arguments
+    args = _LIST_ARGS.validate_python(arguments)
+    max_results = arguments.get("max_results", 20)
+    
+    # Get notifications from Gmail; they are already properly formatted
+    notifications = await _batched_gmail_notifications(args.since, args.query, max_results)
+    
+    logger.info(f"Retrieved {len(notifications)} Gmail notifications")
+    
+    return {
+        "count": len(notifications),
+        "notifications": notifications
+    }
+
+async def _analyze_sender_importance(arguments: dict) -> Dict:
+    sender_email = arguments["sender_email"]
+    days_back = arguments.get("days_back", 30)
+    
+    return await _cached(
+        ("analyze_sender_importance", sender_email, days_back),
+        lambda: gmail_integration.analyze_sender_importance(sender_email, days_back)
+    )
+
+async def _get_recent_conversations(arguments: dict) -> Dict:
+    contact_email = arguments["contact_email"]
+    days_back = arguments.get("days_back", 7)
+    max_messages = arguments.get("max_messages", 10)
+    
+    conversations = await _singleflight(
+        ("get_recent_conversations", contact_email, days_back, max_messages),
+        lambda: gmail_integration.get_recent_conversations(contact_email, days_back, max_messages)
+    )
+    
+    return {
+        "contact": contact_email,
+        "conversations": conversations
+    }
+
+async def _check_sender_domain(arguments: dict) -> Dict:
+    return await gmail_integration.check_sender_domain(arguments["sender_email"])
+
+# Slack tools
+async def _list_slack_notifications(arguments: dict) -> Dict:
+    args = _SLACK_LIST_ARGS.validate_python(arguments)
+    
+    # Notifications are already properly formatted
+    notifications = await _singleflight(
+        ("list_slack_notifications", args.since_timestamp, args.channel_filter, args.max_results),
+        lambda: slack_integration.list_notifications(
+            since_timestamp=args.since_timestamp,
+            channel_filter=args.channel_filter,
+            max_results=args.max_results
         )
-    ]
+    )
+    
+    logger.info(f"Retrieved {len(notifications)} Slack notifications")
+    
+    return {
+        "count": len(notifications),
+        "notifications": notifications
+    }
+
+async def _analyze_slack_user_importance(arguments: dict) -> Dict:
+    user_id = arguments["user_id"]
+    days_back = arguments.get("days_back", 30)
+    
+    async def fetch():
+        # Count every sender's activity with one paged search the first time
+        # a window is analyzed, so later users skip their own search. The
+        # integration shares one prime between concurrent callers.
+        try:
+            await slack_integration.ensure_sender_activity(days_back)
+        except Exception:
+            logger.warning("Could not prime Slack sender activity", exc_info=True)
+        return await slack_integration.analyze_sender_importance(user_id, days_back)
+    
+    return await _cached(("analyze_slack_user_importance", user_id, days_back), fetch)
+
+async def _get_slack_conversations(arguments: dict) -> Dict:
+    user_id = arguments["user_id"]
+    days_back = arguments.get("days_back", 7)
+    max_messages = arguments.get("max_messages", 10)
+    
+    conversations = await _singleflight(
+        ("get_slack_conversations", user_id, days_back, max_messages),
+        lambda: slack_integration.get_recent_conversations(user_id, days_back, max_messages)
+    )
+    
+    return {
+        "user_id": user_id,
+        "conversations": conversations
+    }
+
+async def _check_slack_user_workspace(arguments: dict) -> Dict:
+    user_id = arguments["user_id"]
+    
+    return await _cached(
+        ("check_slack_user_workspace", user_id),
+        lambda: slack_integration.check_user_workspace(user_id)
+    )
+
+async def _get_slack_channel_info(arguments: dict) -> Dict:
+    channel_id = arguments["channel_id"]
+    
+    return await _singleflight(
+        ("get_slack_channel_info", channel_id),
+        lambda: slack_integration.get_channel_info(channel_id)
+    )
+
+async def _slack_unavailable(arguments: dict) -> Dict:
+    return {"error": "Slack integration not available"}
+
+async def _flush_cache(arguments: dict) -> Dict:
+    flushed = len(_tool_cache)
+    _tool_cache.clear()
+    return {"flushed": flushed}
+
+# Aggregate tools
+async def _list_all_notifications(arguments: dict) -> Dict:
+    args = _LIST_ALL_ARGS.validate_python(arguments)
+    
+    # Fetch both platforms concurrently; one failing does not sink the other
+    platforms = ["gmail"]
+    fetches = [_singleflight(
+        ("list_all_notifications", "gmail", args.since, args.max_results),
+        lambda: gmail_integration.list_notifications(
+            since_iso=args.since,
+            max_results=args.max_results
+        )
+    )]
+    if slack_integration:
+        platforms.append("slack")
+        fetches.append(_singleflight(
+            ("list_all_notifications", "slack", args.since, args.max_results),
+            lambda: slack_integration.list_notifications(
+                since_timestamp=args.since,
+                max_results=args.max_results
+            )
+        ))
+    results = await asyncio.gather(*fetches, return_exceptions=True)
+    
+    notifications = []
+    errors = {}
+    for platform, result in zip(platforms, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Error listing {platform} notifications: {result}")
+            errors[platform] = str(result)
+        else:
+            notifications.extend(result)
+    if not slack_integration:
+        errors["slack"] = "Slack integration not available"
+    
+    logger.info(f"Retrieved {len(notifications)} notifications across platforms")
+    
+    return {
+        "count": len(notifications),
+        "notifications": notifications,
+        "errors": errors
+    }
+
+_SLACK_HANDLERS = {
+    "list_slack_notifications": _list_slack_notifications,
+    "analyze_slack_user_importance": _analyze_slack_user_importance,
+    "get_slack_conversations": _get_slack_conversations,
+    "check_slack_user_workspace": _check_slack_user_workspace,
+    "get_slack_channel_info": _get_slack_channel_info,
+}
+
+# Tool name -> handler. Slack tools are bound to a stub when the integration
+# failed to initialize, so handlers never need to check for it.
+HANDLERS = {
+    "list_gmail_notifications": _list_gmail_notifications,
+    "analyze_sender_importance": _analyze_sender_importance,
+    "get_recent_conversations": _get_recent_conversations,
+    "check_sender_domain": _check_sender_domain,
+    **{
+        tool_name: handler if slack_integration else _slack_unavailable
+        for tool_name, handler in _SLACK_HANDLERS.items()
+    },
+    "list_all_notifications": _list_all_notifications,
+    "flush_cache": _flush_cache,
+}
 
 @server.call_tool()
 async def call_tool(name: str, arguments: dict) -> List[TextContent]:
     """Handle tool calls"""
-    print(f"🔧 Client called tool: {name} with args: {arguments}")
+    logger.debug("Client called tool %s with args %s", name, arguments)
     try:
-        if name == "list_gmail_notifications":
-            # Validate arguments
-            args = ListNotificationsArgs(**arguments)
-            max_results = arguments.get("max_results", 20)
-            
-            # Get notifications from Gmail
-            notifications_data = await gmail_integration.list_notifications(
-                since_iso=args.since,
-                query=args.query,
-                max_results=max_results
-            )
-            
-            # Return notifications directly (already properly formatted)
-            notifications = notifications_data
-            
-            logger.info(f"Retrieved {len(notifications)} Gmail notifications")
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps({
-                    "count": len(notifications),
-                    "notifications": notifications
-                }, ensure_ascii=False)
-            )]
-            
-        elif name == "analyze_sender_importance":
-            sender_email = arguments["sender_email"]
-            days_back = arguments.get("days_back", 30)
-            
-            importance_data = await gmail_integration.analyze_sender_importance(
-                sender_email, days_back
-            )
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps(importance_data, ensure_ascii=False)
-            )]
-            
-        elif name == "get_recent_conversations":
-            contact_email = arguments["contact_email"]
-            days_back = arguments.get("days_back", 7)
-            max_messages = arguments.get("max_messages", 10)
-            
-            conversations = await gmail_integration.get_recent_conversations(
-                contact_email, days_back, max_messages
-            )
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps({
-                    "contact": contact_email,
-                    "conversations": conversations
-                }, ensure_ascii=False)
-            )]
-            
-        elif name == "check_sender_domain":
-            sender_email = arguments["sender_email"]
-            domain_info = await gmail_integration.check_sender_domain(sender_email)
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps(domain_info, ensure_ascii=False)
-            )]
-            
-        # Slack tools
-        elif name == "list_slack_notifications":
-            if not slack_integration:
-                return [TextContent(
-                    type="text",
-                    text=json.dumps({"error": "Slack integration not available"})
-                )]
-            
-            args = SlackListNotificationsArgs(**arguments)
-            
-            notifications_data = await slack_integration.list_notifications(
-                since_timestamp=args.since_timestamp,
-                channel_filter=args.channel_filter,
-                max_results=args.max_results
-            )
-            
-            # Return notifications directly (already properly formatted)
-            notifications = notifications_data
-            
-            logger.info(f"Retrieved {len(notifications)} Slack notifications")
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps({
-                    "count": len(notifications),
-                    "notifications": notifications
-                }, ensure_ascii=False)
-            )]
-            
-        elif name == "analyze_slack_user_importance":
-            if not slack_integration:
-                return [TextContent(
-                    type="text",
-                    text=json.dumps({"error": "Slack integration not available"})
-                )]
-            
-            user_id = arguments["user_id"]
-            days_back = arguments.get("days_back", 30)
-            
-            importance_data = await slack_integration.analyze_sender_importance(
-                user_id, days_back
-            )
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps(importance_data, ensure_ascii=False)
-            )]
-            
-        elif name == "get_slack_conversations":
-            if not slack_integration:
-                return [TextContent(
-                    type="text",
-                    text=json.dumps({"error": "Slack integration not available"})
-                )]
-            
-            user_id = arguments["user_id"]
-            days_back = arguments.get("days_back", 7)
-            max_messages = arguments.get("max_messages", 10)
-            
-            conversations = await slack_integration.get_recent_conversations(
-                user_id, days_back, max_messages
-            )
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps({
-                    "user_id": user_id,
-                    "conversations": conversations
-                }, ensure_ascii=False)
-            )]
-            
-        elif name == "check_slack_user_workspace":
-            if not slack_integration:
-                return [TextContent(
-                    type="text",
-                    text=json.dumps({"error": "Slack integration not available"})
-                )]
-            
-            user_id = arguments["user_id"]
-            user_info = await slack_integration.check_user_workspace(user_id)
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps(user_info, ensure_ascii=False)
-            )]
-            
-        elif name == "get_slack_channel_info":
-            if not slack_integration:
-                return [TextContent(
-                    type="text",
-                    text=json.dumps({"error": "Slack integration not available"})
-                )]
-            
-            channel_id = arguments["channel_id"]
-            channel_info = await slack_integration.get_channel_info(channel_id)
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps(channel_info, ensure_ascii=False)
-            )]
-            
-        else:
+        handler = HANDLERS.get(name)
+        if handler is None:
             raise ValueError(f"Unknown tool: {name}")
-            
+        return await _wrap_result(await handler(arguments))
+    
     except Exception as e:
         logger.error(f"Error calling tool {name}: {e}")
-        return [TextContent(
-            type="text",
-            text=json.dumps({
-                "error": str(e),
-                "tool": name,
-                "arguments": arguments
-            })
-        )]
+        return _wrap_json({
+            "error": str(e),
+            "tool": name,
+            "arguments": arguments
+        })
+
+# Capabilities are derived from the handlers registered above, so the
+# initialization options are built once after the last decorator
+_INIT_OPTS = InitializationOptions(
+    server_name="communication-server",
+    server_version="0.1.0",
+    capabilities=server.get_capabilities(
+        notification_options=NotificationOptions(),
+        experimental_capabilities={},
+    ),
+)
 
 async def run():
     """Run the server with lifespan management."""
-    print("🌐 Starting stdio server...")
-    
     async with stdio_server() as (read_stream, write_stream):
-        print("📡 MCP Server running and listening for client connections...")
-        print("💡 Server is ready to process requests!")
-        print("⏳ Waiting for MCP client to connect...")
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="communication-server",
-                server_version="0.1.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
-                ),
-            ),
-        )
+        logger.info("Communication server listening on stdio")
+        try:
+            await server.run(read_stream, write_stream, _INIT_OPTS)
+        finally:
+            gmail_integration.close()
+            if slack_integration:
+                await slack_integration.close()
 
 if __name__ == "__main__":
+    # uvloop speeds up socket and pipe I/O; fall back to the stock loop
+    # where it is unavailable (Windows, minimal installs)
+    if sys.platform != "win32":
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            logger.debug("uvloop not installed, using the default asyncio event loop")
     asyncio.run(run())
\ No newline at end of file
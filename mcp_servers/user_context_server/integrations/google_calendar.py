@@ -1,17 +1,27 @@
 import os
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+import time
+import asyncio
+import logging
+import heapq
+import threading
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from operator import itemgetter
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
+import orjson
+import requests
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.model import JsonModel
 from dotenv import load_dotenv
 
 try:
     from ..models import (
-        CalendarEvent, Calendar, FreeBusyQuery, FreeBusyResponse,
+        Attendee, CalendarEvent, Calendar, FreeBusyQuery, FreeBusyResponse,
         EventFilters, CreateEventRequest, UpdateEventRequest, EventConflict,
         AvailabilitySlot
     )
@@ -20,89 +30,229 @@ except ImportError:
     from pathlib import Path
     sys.path.append(str(Path(__file__).parent.parent.parent.parent))
     from mcp_servers.user_context_server.models import (
-        CalendarEvent, Calendar, FreeBusyQuery, FreeBusyResponse,
+        Attendee, CalendarEvent, Calendar, FreeBusyQuery, FreeBusyResponse,
         EventFilters, CreateEventRequest, UpdateEventRequest, EventConflict,
         AvailabilitySlot
     )
 
+# RFC 3339 timestamps are parsed by ciso8601 when installed; the stdlib
+# fallback only rewrites a trailing Z, which older fromisoformat rejects
+try:
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:
+    def _parse_iso(value: str) -> datetime:
+        if value.endswith('Z'):
+            value = value[:-1] + '+00:00'
+        return datetime.fromisoformat(value)
+
+# Recurring instances and free/busy edges repeat the same timestamps, so
+# parses are memoized; datetimes are immutable and safe to share
+_parse_timestamp = lru_cache(maxsize=4096)(_parse_iso)
+
 env_path = Path(__file__).parent.parent.parent.parent / ".env"
-load_dotenv(dotenv_path=env_path, override=True)
+
+# Google responses follow a fixed schema, so models built from them skip
+# validation unless CALENDAR_STRICT_VALIDATION=1 is set in the process env
+STRICT_VALIDATION = os.getenv("CALENDAR_STRICT_VALIDATION") == "1"
+
+def _from_api(model, **fields):
+    """Build a model from trusted API data, validating only in strict mode"""
+    if STRICT_VALIDATION:
+        return model(**fields)
+    return model.model_construct(**fields)
 
 SCOPES = [
     "https://www.googleapis.com/auth/calendar",
     "https://www.googleapis.com/auth/calendar.events"
 ]
 
+@lru_cache(maxsize=None)
+def _client_settings() -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Load .env on first use and return the OAuth refresh token, client id and client secret
+
+    Deployments that populate the environment themselves can set SKIP_DOTENV
+    to skip reading the file. Missing values are only reported when a token
+    is minted, so the server still starts without them.
+    """
+    if not os.getenv("SKIP_DOTENV"):
+        load_dotenv(dotenv_path=env_path, override=True)
+    return (
+        os.getenv("GOOGLE_CALENDAR_REFRESH_TOKEN"),
+        os.getenv("GOOGLE_CALENDAR_CLIENT_ID"),
+        os.getenv("GOOGLE_CALENDAR_CLIENT_SECRET")
+    )
+
+# Access tokens are cached per client id and reused until shortly before
+# they expire, so new instances skip the OAuth round trip
+TOKEN_EXPIRY_SKEW = timedelta(seconds=60)
+_TOKEN_CACHE: Dict[str, Tuple[str, Optional[datetime]]] = {}
+_TOKEN_LOCK = threading.Lock()
+_CREDENTIALS: Optional[Credentials] = None
+# Refreshes go through one pooled session so the connection to the token
+# endpoint is kept alive between refreshes
+_TOKEN_SESSION = requests.Session()
+_TOKEN_REQUEST = Request(_TOKEN_SESSION)
+
+# Calendar clients are shared by every integration instance so their
+# keep-alive connections are reused. httplib2 connections are not
+# thread-safe, so each thread gets its own client.
+_SERVICES = threading.local()
+
+# Per-calendar requests run concurrently in worker threads, capped to stay
+# under Google's per-user QPS limits
+MAX_CONCURRENT_CALENDAR_REQUESTS = 8
+_REQUEST_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENT_CALENDAR_REQUESTS)
+
+# Google accepts up to 50 calls in one batch request
+CALENDAR_BATCH_SIZE = 50
+
+# Partial-response masks limited to the fields the converters below read
+EVENT_LIST_FIELDS = (
+    "nextPageToken,"
+    "items(id,summary,description,start,end,location,status,visibility,created,updated,"
+    "creator/email,organizer/email,attendees(email,displayName,responseStatus,optional,resource,organizer,comment),"
+    "recurrence,originalStartTime,recurringEventId,hangoutLink,conferenceData/entryPoints/uri,"
+    "eventType,sequence,transparency,iCalUID)"
+)
+CALENDAR_LIST_FIELDS = "etag,items(id,summary,description,timeZone,backgroundColor,primary,accessRole,selected)"
+
+# The calendar list is revalidated with its ETag, so an unchanged list
+# comes back as a bodiless 304. The cached copy is only a validator and is
+# never served without asking, so it is kept far longer than the server's
+# response cache (MCP_CALENDARS_CACHE_TTL) that sits in front of it.
+CALENDAR_LIST_ETAG_TTL = 24 * 3600
+
+logger = logging.getLogger(__name__)
+
+class _OrjsonModel(JsonModel):
+    """JsonModel that decodes response bodies with orjson"""
+    
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # orjson rejects lone surrogates and non-JSON bodies the stdlib
+            # parser tolerates, so those keep the original behaviour
+            return super().deserialize(content)
+        if self._data_wrapper and isinstance(body, dict) and "data" in body:
+            body = body["data"]
+        return body
+
+# Stateless, so one instance is shared by every Calendar client
+_RESPONSE_MODEL = _OrjsonModel(data_wrapper=False)
+
 class GoogleCalendarIntegration:
     """Google Calendar integration for user context and scheduling"""
     
     def __init__(self):
         self.service = None
+        # (etag, calendars, monotonic time fetched)
+        self._calendar_list_cache: Optional[Tuple[str, List[Calendar], float]] = None
         self._initialize_service()
     
     def _mint_access_token(self) -> str:
-        """Generate access token from refresh token"""
-        refresh = os.getenv("GOOGLE_CALENDAR_REFRESH_TOKEN")
-        cid = os.getenv("GOOGLE_CALENDAR_CLIENT_ID")
-        csec = os.getenv("GOOGLE_CALENDAR_CLIENT_SECRET")
-        
+        """Return a cached access token, refreshing it from the refresh token near expiry"""
+        global _CREDENTIALS
+        refresh, cid, csec = _client_settings()
         if not all([refresh, cid, csec]):
             raise RuntimeError("Missing env: GOOGLE_CALENDAR_REFRESH_TOKEN / GOOGLE_CALENDAR_CLIENT_ID / GOOGLE_CALENDAR_CLIENT_SECRET")
         
-        creds = Credentials(
-            None,
-            refresh_token=refresh,
-            token_uri="https://oauth2.googleapis.com/token",
-            client_id=cid,
-            client_secret=csec,
-            scopes=SCOPES
-        )
-        creds.refresh(Request())
-        return creds.token
+        with _TOKEN_LOCK:
+            cached = _TOKEN_CACHE.get(cid)
+            # google-auth reports expiry as a naive UTC datetime
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            if cached and (cached[1] is None or now < cached[1] - TOKEN_EXPIRY_SKEW):
+                return cached[0]
+            
+            if _CREDENTIALS is None:
+                _CREDENTIALS = Credentials(
+                    None,
+                    refresh_token=refresh,
+                    token_uri="https://oauth2.googleapis.com/token",
+                    client_id=cid,
+                    client_secret=csec,
+                    scopes=SCOPES
+                )
+            _CREDENTIALS.refresh(_TOKEN_REQUEST)
+            _TOKEN_CACHE[cid] = (_CREDENTIALS.token, _CREDENTIALS.expiry)
+            return _CREDENTIALS.token
     
     def _initialize_service(self):
         """Initialize Google Calendar service"""
         try:
-            token = self._mint_access_token()
-            creds = Credentials(token=token)
-            self.service = build('calendar', 'v3', credentials=creds)
+            self._get_service()
         except Exception as e:
-            print(f"Failed to initialize Google Calendar service: {e}")
+            logger.warning("Failed to initialize Google Calendar service: %s", e)
             self.service = None
     
+    def _get_service(self):
+        """Return this thread's shared Calendar service, rebuilding it only when the access token was refreshed"""
+        token = self._mint_access_token()
+        if getattr(_SERVICES, "token", None) != token:
+            creds = Credentials(token=token)
+            _SERVICES.service = build('calendar', 'v3', credentials=creds, cache_discovery=False, model=_RESPONSE_MODEL)
+            _SERVICES.token = token
+        self.service = _SERVICES.service
+        return self.service
+    
+    def close(self):
+        """Close this thread's Calendar client connections and the token refresh session"""
+        service = getattr(_SERVICES, "service", None)
+        if service is not None:
+            service.close()
+            _SERVICES.__dict__.clear()
+        self.service = None
+        _TOKEN_SESSION.close()
+    
     def _parse_datetime(self, dt_dict: Dict[str, Any]) -> datetime:
         """Parse Google Calendar datetime format"""
         if 'dateTime' in dt_dict:
-            return datetime.fromisoformat(dt_dict['dateTime'].replace('Z', '+00:00'))
+            return _parse_timestamp(dt_dict['dateTime'])
         elif 'date' in dt_dict:
-            return datetime.fromisoformat(dt_dict['date'] + 'T00:00:00+00:00')
+            return _parse_timestamp(dt_dict['date'] + 'T00:00:00+00:00')
         else:
             raise ValueError("Invalid datetime format")
     
-    def _format_datetime(self, dt: datetime, is_all_day: bool = False) -> Dict[str, str]:
-        """Format datetime for Google Calendar API"""
+    def _format_range(self, start: datetime, end: datetime, is_all_day: bool = False,
+                      tz: Optional[str] = None) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Format event start and end for Google Calendar API, with the time zone set up front"""
         if is_all_day:
-            return {'date': dt.date().isoformat()}
-        else:
-            return {'dateTime': dt.isoformat(), 'timeZone': 'UTC'}
+            return {'date': start.date().isoformat()}, {'date': end.date().isoformat()}
+        tz = tz or 'UTC'
+        return {'dateTime': start.isoformat(), 'timeZone': tz}, {'dateTime': end.isoformat(), 'timeZone': tz}
     
     def _convert_to_calendar_event(self, event_data: Dict[str, Any], calendar_id: str) -> CalendarEvent:
         """Convert Google Calendar event to our CalendarEvent model"""
         start_time = self._parse_datetime(event_data['start'])
         end_time = self._parse_datetime(event_data['end'])
         
-        attendees = []
-        if 'attendees' in event_data:
-            for attendee in event_data['attendees']:
-                attendees.append({
-                    'email': attendee.get('email', ''),
-                    'display_name': attendee.get('displayName'),
-                    'response_status': attendee.get('responseStatus', 'needsAction'),
-                    'optional': attendee.get('optional', False),
-                    'organizer': attendee.get('organizer', False)
-                })
-        
-        return CalendarEvent(
+        attendees_data = event_data.get('attendees')
+        attendees = [
+            Attendee(
+                email=attendee.get('email', ''),
+                display_name=attendee.get('displayName'),
+                response_status=attendee.get('responseStatus', 'needsAction'),
+                optional=attendee.get('optional', False),
+                resource=attendee.get('resource', False),
+                organizer=attendee.get('organizer', False),
+                comment=attendee.get('comment')
+            )
+            for attendee in attendees_data
+        ] if attendees_data else []
+        
+        # Most events have no conference data, so only descend into it when present
+        meeting_url = event_data.get('hangoutLink')
+        if not meeting_url:
+            conference = event_data.get('conferenceData')
+            if conference:
+                entry_points = conference.get('entryPoints')
+                if entry_points:
+                    meeting_url = entry_points[0].get('uri')
+        
+        original_start = event_data.get('originalStartTime')
+        
+        return _from_api(
+            CalendarEvent,
             id=event_data['id'],
             calendar_id=calendar_id,
             provider="google",
@@ -115,15 +265,15 @@ class GoogleCalendarIntegration:
             status=event_data.get('status', 'confirmed'),
             visibility=event_data.get('visibility', 'default'),
             is_all_day='date' in event_data['start'],
-            created_at=datetime.fromisoformat(event_data['created'].replace('Z', '+00:00')),
-            updated_at=datetime.fromisoformat(event_data['updated'].replace('Z', '+00:00')),
+            created_at=_parse_timestamp(event_data['created']),
+            updated_at=_parse_timestamp(event_data['updated']),
             creator_email=event_data.get('creator', {}).get('email'),
             organizer_email=event_data.get('organizer', {}).get('email'),
             attendees=attendees,
             recurrence_rules=event_data.get('recurrence'),
-            original_start_time=self._parse_datetime(event_data['originalStartTime']) if 'originalStartTime' in event_data else None,
+            original_start_time=self._parse_datetime(original_start) if original_start else None,
             recurring_event_id=event_data.get('recurringEventId'),
-            meeting_url=event_data.get('hangoutLink') or event_data.get('conferenceData', {}).get('entryPoints', [{}])[0].get('uri'),
+            meeting_url=meeting_url,
             metadata={
                 'google_event_type': event_data.get('eventType'),
                 'google_sequence': event_data.get('sequence'),
@@ -134,15 +284,25 @@ class GoogleCalendarIntegration:
     
     async def list_calendars(self) -> List[Calendar]:
         """List all calendars accessible to the user"""
-        if not self.service:
-            raise RuntimeError("Google Calendar service not initialized")
+        service = self._get_service()
+        
+        cached = self._calendar_list_cache
+        if cached and time.monotonic() - cached[2] >= CALENDAR_LIST_ETAG_TTL:
+            cached = self._calendar_list_cache = None
         
         try:
-            calendars_result = self.service.calendarList().list().execute()
-            calendars = []
-            
-            for cal_data in calendars_result.get('items', []):
-                calendar = Calendar(
+            request = service.calendarList().list(fields=CALENDAR_LIST_FIELDS)
+            if cached:
+                request.headers['If-None-Match'] = cached[0]
+            try:
+                calendars_result = request.execute()
+            except HttpError as e:
+                if cached and e.resp.status == 304:
+                    return list(cached[1])
+                raise
+            calendars = [
+                _from_api(
+                    Calendar,
                     id=cal_data['id'],
                     provider="google",
                     name=cal_data['summary'],
@@ -153,59 +313,150 @@ class GoogleCalendarIntegration:
                     access_role=cal_data.get('accessRole'),
                     selected=cal_data.get('selected', True)
                 )
-                calendars.append(calendar)
+                for cal_data in calendars_result.get('items', ())
+            ]
             
-            return calendars
+            etag = calendars_result.get('etag')
+            if etag:
+                self._calendar_list_cache = (etag, calendars, time.monotonic())
+            return list(calendars)
         except HttpError as e:
             raise RuntimeError(f"Failed to list calendars: {e}")
     
     async def list_events(self, filters: EventFilters) -> List[CalendarEvent]:
         """List events with optional filters"""
-        if not self.service:
-            raise RuntimeError("Google Calendar service not initialized")
+        self._get_service()
+        calendar_ids = filters.calendar_ids or ['primary']
+        
+        # Calendars are listed in batched requests of up to CALENDAR_BATCH_SIZE,
+        # with the batches running concurrently in worker threads
+        async def fetch(chunk: List[str]) -> List[CalendarEvent]:
+            async with _REQUEST_SEMAPHORE:
+                if len(chunk) == 1:
+                    return await asyncio.to_thread(self._list_calendar_events, chunk[0], filters)
+                return await asyncio.to_thread(self._batch_list_events, chunk, filters)
+        
+        results = await asyncio.gather(*(
+            fetch(calendar_ids[start:start + CALENDAR_BATCH_SIZE])
+            for start in range(0, len(calendar_ids), CALENDAR_BATCH_SIZE)
+        ))
         
         events = []
-        calendar_ids = filters.calendar_ids or ['primary']
+        for chunk_events in results:
+            events.extend(chunk_events)
+        return events
+    
+    def _events_list_request(self, service, calendar_id: str, filters: EventFilters, page_token: Optional[str] = None):
+        """Build the events().list request for one calendar"""
+        params = {
+            'calendarId': calendar_id,
+            'maxResults': filters.max_results,
+            'singleEvents': filters.single_events,
+            'orderBy': filters.order_by,
+            'showDeleted': filters.show_deleted,
+            'fields': EVENT_LIST_FIELDS
+        }
         
-        for calendar_id in calendar_ids:
+        if filters.start_time:
+            params['timeMin'] = filters.start_time.isoformat()
+        if filters.end_time:
+            params['timeMax'] = filters.end_time.isoformat()
+        if filters.search_query:
+            params['q'] = filters.search_query
+        if page_token:
+            params['pageToken'] = page_token
+        
+        return service.events().list(**params)
+    
+    def _convert_events_result(self, events_result: Dict[str, Any], calendar_id: str,
+                               filters: EventFilters) -> List[CalendarEvent]:
+        """Convert an events().list response to CalendarEvents, skipping items without a start
+        
+        All-day items are dropped before conversion when the filters exclude them.
+        """
+        items = events_result.get('items', ())
+        if filters.exclude_all_day:
+            return [
+                self._convert_to_calendar_event(event_data, calendar_id)
+                for event_data in items
+                if 'start' in event_data and 'date' not in event_data['start']
+            ]
+        return [
+            self._convert_to_calendar_event(event_data, calendar_id)
+            for event_data in items
+            if 'start' in event_data
+        ]
+    
+    def _collect_events(self, service, calendar_id: str, filters: EventFilters,
+                        events_result: Dict[str, Any]) -> List[CalendarEvent]:
+        """Convert a first events().list page, following nextPageToken until max_results events
+        
+        Google may return short or empty pages even when more events match.
+        """
+        events = self._convert_events_result(events_result, calendar_id, filters)
+        while len(events) < filters.max_results and events_result.get('nextPageToken'):
+            events_result = self._events_list_request(
+                service, calendar_id, filters, events_result['nextPageToken']
+            ).execute()
+            events.extend(self._convert_events_result(events_result, calendar_id, filters))
+        return events[:filters.max_results]
+    
+    def _list_calendar_events(self, calendar_id: str, filters: EventFilters) -> List[CalendarEvent]:
+        """Synchronously list one calendar's events, returning none if the request fails"""
+        try:
+            service = self._get_service()
+            events_result = self._events_list_request(service, calendar_id, filters).execute()
+            return self._collect_events(service, calendar_id, filters, events_result)
+        except HttpError as e:
+            logger.warning("Failed to list events for calendar %s: %s", calendar_id, e)
+            return []
+    
+    def _batch_list_events(self, calendar_ids: List[str], filters: EventFilters) -> List[CalendarEvent]:
+        """Synchronously list several calendars' events in one batched HTTP request, in calendar order"""
+        service = self._get_service()
+        first_pages: Dict[str, Dict[str, Any]] = {}
+        
+        # Request ids are positions, since a calendar may be listed twice
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                logger.warning("Failed to list events for calendar %s: %s", calendar_ids[int(request_id)], exception)
+                return
+            first_pages[request_id] = response
+        
+        batch = service.new_batch_http_request(callback=on_response)
+        for index, calendar_id in enumerate(calendar_ids):
+            batch.add(self._events_list_request(service, calendar_id, filters), request_id=str(index))
+        
+        try:
+            batch.execute()
+        except HttpError as e:
+            # The batch endpoint itself failed; list these calendars one by one
+            logger.warning("Calendar batch request failed, falling back to single requests: %s", e)
+            return [
+                event
+                for calendar_id in calendar_ids
+                for event in self._list_calendar_events(calendar_id, filters)
+            ]
+        
+        # Later pages are fetched once the batch has completed
+        events = []
+        for index, calendar_id in enumerate(calendar_ids):
+            events_result = first_pages.get(str(index))
+            if events_result is None:
+                continue
             try:
-                params = {
-                    'calendarId': calendar_id,
-                    'maxResults': filters.max_results,
-                    'singleEvents': filters.single_events,
-                    'orderBy': filters.order_by,
-                    'showDeleted': filters.show_deleted
-                }
-                
-                if filters.start_time:
-                    params['timeMin'] = filters.start_time.isoformat()
-                if filters.end_time:
-                    params['timeMax'] = filters.end_time.isoformat()
-                if filters.search_query:
-                    params['q'] = filters.search_query
-                
-                events_result = self.service.events().list(**params).execute()
-                
-                for event_data in events_result.get('items', []):
-                    if 'start' in event_data:
-                        event = self._convert_to_calendar_event(event_data, calendar_id)
-                        events.append(event)
-                        
+                events.extend(self._collect_events(service, calendar_id, filters, events_result))
             except HttpError as e:
-                print(f"Failed to list events for calendar {calendar_id}: {e}")
-                continue
-        
+                logger.warning("Failed to list events for calendar %s: %s", calendar_id, e)
         return events
     
-    async def create_event(self, request: CreateEventRequest) -> CalendarEvent:
-        """Create a new calendar event"""
-        if not self.service:
-            raise RuntimeError("Google Calendar service not initialized")
-        
+    def _event_body(self, request: CreateEventRequest) -> Dict[str, Any]:
+        """Build the Google Calendar event resource for a create request"""
+        start, end = self._format_range(request.start_time, request.end_time, request.is_all_day, request.timezone)
         event_body = {
             'summary': request.title,
-            'start': self._format_datetime(request.start_time, request.is_all_day),
-            'end': self._format_datetime(request.end_time, request.is_all_day),
+            'start': start,
+            'end': end,
             'visibility': request.visibility
         }
         
@@ -213,10 +464,6 @@ class GoogleCalendarIntegration:
             event_body['description'] = request.description
         if request.location:
             event_body['location'] = request.location
-        if request.timezone:
-            if not request.is_all_day:
-                event_body['start']['timeZone'] = request.timezone
-                event_body['end']['timeZone'] = request.timezone
         
         if request.attendees:
             event_body['attendees'] = [{'email': email} for email in request.attendees]
@@ -227,8 +474,15 @@ class GoogleCalendarIntegration:
         if request.reminders:
             event_body['reminders'] = {'useDefault': False, 'overrides': request.reminders}
         
+        return event_body
+    
+    async def create_event(self, request: CreateEventRequest) -> CalendarEvent:
+        """Create a new calendar event"""
+        service = self._get_service()
+        event_body = self._event_body(request)
+        
         try:
-            created_event = self.service.events().insert(
+            created_event = service.events().insert(
                 calendarId=request.calendar_id,
                 body=event_body
             ).execute()
@@ -237,44 +491,109 @@ class GoogleCalendarIntegration:
         except HttpError as e:
             raise RuntimeError(f"Failed to create event: {e}")
     
+    async def create_events_bulk(self, requests: List[CreateEventRequest]) -> Tuple[List[CalendarEvent], List[Dict[str, Any]]]:
+        """Create many calendar events using batched HTTP requests
+        
+        Returns the created events in request order and one failure entry per
+        request that was not created. A failing chunk does not stop the rest.
+        An event that was created but could not be converted is reported as a
+        failure carrying its created_event_id, so it is not created again.
+        """
+        self._get_service()
+        return await asyncio.to_thread(self._create_events_bulk_sync, requests)
+    
+    def _create_events_bulk_sync(self, requests: List[CreateEventRequest]) -> Tuple[List[CalendarEvent], List[Dict[str, Any]]]:
+        """Synchronous implementation of create_events_bulk"""
+        service = self._get_service()
+        created: Dict[str, CalendarEvent] = {}
+        errors: Dict[str, str] = {}
+        created_ids: Dict[str, str] = {}
+        
+        def on_response(request_id, response, exception):
+            request = requests[int(request_id)]
+            if exception is not None:
+                logger.warning("Failed to create event %r: %s", request.title, exception)
+                errors[request_id] = str(exception)
+                return
+            # The event exists even if it cannot be converted, so report its
+            # id rather than letting the error abort the batch and the report
+            try:
+                created[request_id] = self._convert_to_calendar_event(response, request.calendar_id)
+            except Exception as e:
+                logger.warning("Created event %r could not be read back: %s", request.title, e)
+                errors[request_id] = str(e)
+                created_ids[request_id] = response.get('id')
+        
+        for start in range(0, len(requests), CALENDAR_BATCH_SIZE):
+            chunk = range(start, min(start + CALENDAR_BATCH_SIZE, len(requests)))
+            batch = service.new_batch_http_request(callback=on_response)
+            for index in chunk:
+                request = requests[index]
+                batch.add(
+                    service.events().insert(calendarId=request.calendar_id, body=self._event_body(request)),
+                    request_id=str(index)
+                )
+            
+            try:
+                batch.execute()
+            except HttpError as e:
+                # Earlier chunks are already created, so record this one and go on
+                logger.warning("Calendar batch insert failed: %s", e)
+                for index in chunk:
+                    if str(index) not in created:
+                        errors.setdefault(str(index), str(e))
+        
+        events = [created[str(index)] for index in range(len(requests)) if str(index) in created]
+        failures = []
+        for index in range(len(requests)):
+            request_id = str(index)
+            if request_id in errors:
+                failure = {"index": index, "title": requests[index].title, "error": errors[request_id]}
+                if request_id in created_ids:
+                    failure["created_event_id"] = created_ids[request_id]
+                failures.append(failure)
+        return events, failures
+    
     async def update_event(self, request: UpdateEventRequest) -> CalendarEvent:
-        """Update an existing calendar event"""
-        if not self.service:
-            raise RuntimeError("Google Calendar service not initialized")
+        """Update an existing calendar event, sending only the changed fields"""
+        service = self._get_service()
         
         try:
-            existing_event = self.service.events().get(
-                calendarId=request.calendar_id,
-                eventId=request.event_id
-            ).execute()
-            
+            patch_body = {}
             if request.title is not None:
-                existing_event['summary'] = request.title
+                patch_body['summary'] = request.title
             if request.description is not None:
-                existing_event['description'] = request.description
+                patch_body['description'] = request.description
             if request.location is not None:
-                existing_event['location'] = request.location
+                patch_body['location'] = request.location
             if request.visibility is not None:
-                existing_event['visibility'] = request.visibility
+                patch_body['visibility'] = request.visibility
             if request.status is not None:
-                existing_event['status'] = request.status
+                patch_body['status'] = request.status
             
             if request.start_time is not None and request.end_time is not None:
-                is_all_day = 'date' in existing_event['start']
-                existing_event['start'] = self._format_datetime(request.start_time, is_all_day)
-                existing_event['end'] = self._format_datetime(request.end_time, is_all_day)
-                
-                if request.timezone and not is_all_day:
-                    existing_event['start']['timeZone'] = request.timezone
-                    existing_event['end']['timeZone'] = request.timezone
+                is_all_day = request.is_all_day
+                if is_all_day is None:
+                    # Keep the event's current all-day shape, which is only known to the API
+                    existing_event = service.events().get(
+                        calendarId=request.calendar_id,
+                        eventId=request.event_id,
+                        fields='start'
+                    ).execute()
+                    is_all_day = 'date' in existing_event['start']
+                start, end = self._format_range(request.start_time, request.end_time, is_all_day, request.timezone)
+                # Patch merges into the stored start/end, so clear the form not being sent
+                other = 'dateTime' if is_all_day else 'date'
+                start[other] = end[other] = None
+                patch_body['start'], patch_body['end'] = start, end
             
             if request.attendees is not None:
-                existing_event['attendees'] = [{'email': email} for email in request.attendees]
+                patch_body['attendees'] = [{'email': email} for email in request.attendees]
             
-            updated_event = self.service.events().update(
+            updated_event = service.events().patch(
                 calendarId=request.calendar_id,
                 eventId=request.event_id,
-                body=existing_event
+                body=patch_body
             ).execute()
             
             return self._convert_to_calendar_event(updated_event, request.calendar_id)
@@ -283,11 +602,10 @@ class GoogleCalendarIntegration:
     
     async def delete_event(self, calendar_id: str, event_id: str) -> bool:
         """Delete a calendar event"""
-        if not self.service:
-            raise RuntimeError("Google Calendar service not initialized")
+        service = self._get_service()
         
         try:
-            self.service.events().delete(
+            service.events().delete(
                 calendarId=calendar_id,
                 eventId=event_id
             ).execute()
@@ -298,9 +616,18 @@ class GoogleCalendarIntegration:
             raise RuntimeError(f"Failed to delete event: {e}")
     
     async def get_free_busy(self, query: FreeBusyQuery) -> List[FreeBusyResponse]:
-        """Get free/busy information for specified calendars"""
-        if not self.service:
-            raise RuntimeError("Google Calendar service not initialized")
+        """Get free/busy information for specified calendars
+        
+        The query runs in a worker thread under the shared request limit, so
+        concurrent tool calls are not serialized behind it on the event loop.
+        """
+        self._get_service()
+        async with _REQUEST_SEMAPHORE:
+            return await asyncio.to_thread(self._get_free_busy_sync, query)
+    
+    def _get_free_busy_sync(self, query: FreeBusyQuery) -> List[FreeBusyResponse]:
+        """Synchronous implementation of get_free_busy"""
+        service = self._get_service()
         
         body = {
             'timeMin': query.start_time.isoformat(),
@@ -309,23 +636,21 @@ class GoogleCalendarIntegration:
         }
         
         try:
-            freebusy_result = self.service.freebusy().query(body=body).execute()
+            freebusy_result = service.freebusy().query(body=body).execute()
             responses = []
             
             for calendar_id in query.calendar_ids:
                 cal_data = freebusy_result['calendars'].get(calendar_id, {})
-                busy_periods = []
-                
-                for busy in cal_data.get('busy', []):
-                    busy_periods.append({
-                        'start': datetime.fromisoformat(busy['start'].replace('Z', '+00:00')),
-                        'end': datetime.fromisoformat(busy['end'].replace('Z', '+00:00'))
-                    })
+                busy_periods = [
+                    {'start': _parse_timestamp(busy['start']), 'end': _parse_timestamp(busy['end'])}
+                    for busy in cal_data.get('busy', ())
+                ]
                 
                 errors = cal_data.get('errors', [])
                 error_messages = [error.get('reason', 'Unknown error') for error in errors]
                 
-                responses.append(FreeBusyResponse(
+                responses.append(_from_api(
+                    FreeBusyResponse,
                     calendar_id=calendar_id,
                     busy_periods=busy_periods,
                     errors=error_messages
@@ -344,24 +669,45 @@ class GoogleCalendarIntegration:
             single_events=True
         )
         
-        events = await self.list_events(filters)
-        conflicts = []
+        return self.detect_conflicts(await self.list_events(filters))
+    
+    def detect_conflicts(self, events: List[CalendarEvent]) -> List[EventConflict]:
+        """Find every pair of overlapping events among already listed events"""
+        # Event bounds are converted to epoch seconds once so the sweep
+        # compares and subtracts ints rather than datetimes
+        spans = [(int(event.start_time.timestamp()), int(event.end_time.timestamp())) for event in events]
+        
+        # Sweep events in start order, keeping a heap of those still running
+        # keyed by end time, so only events that can overlap are compared.
+        # Pairs are recorded by list position to keep the pairwise ordering.
+        pairs = []
+        active = []
+        for j in sorted(range(len(events)), key=spans.__getitem__):
+            start, end = spans[j]
+            while active and active[0][0] <= start:
+                heapq.heappop(active)
+            for active_end, i in active:
+                if spans[i][0] < end:
+                    # Overlap in whole minutes, as _get_overlap_duration computes it
+                    overlap = (min(active_end, end) - max(spans[i][0], start)) // 60
+                    pairs.append((min(i, j), max(i, j), overlap))
+            heapq.heappush(active, (end, j))
+        pairs.sort()
         
-        for i, event1 in enumerate(events):
-            for event2 in events[i+1:]:
-                if self._events_conflict(event1, event2):
-                    conflict_type = self._get_conflict_type(event1, event2)
-                    duration = self._get_overlap_duration(event1, event2)
-                    
-                    conflicts.append(EventConflict(
-                        event_id=event1.id,
-                        title=event1.title,
-                        start_time=event1.start_time,
-                        end_time=event1.end_time,
-                        calendar_id=event1.calendar_id,
-                        conflict_type=conflict_type,
-                        duration_minutes=duration
-                    ))
+        conflicts = []
+        for i, j, duration in pairs:
+            event1, event2 = events[i], events[j]
+            conflict_type = self._get_conflict_type(event1, event2)
+            
+            conflicts.append(EventConflict(
+                event_id=event1.id,
+                title=event1.title,
+                start_time=event1.start_time,
+                end_time=event1.end_time,
+                calendar_id=event1.calendar_id,
+                conflict_type=conflict_type,
+                duration_minutes=duration
+            ))
         
         return conflicts
     
@@ -399,19 +745,23 @@ class GoogleCalendarIntegration:
         
         freebusy_data = await self.get_free_busy(freebusy_query)
         
+        # Each calendar's periods usually arrive in start order, which the
+        # sort merges as runs rather than re-sorting from scratch
         all_busy_periods = []
         for response in freebusy_data:
             all_busy_periods.extend(response.busy_periods)
+        all_busy_periods.sort(key=itemgetter('start'))
         
-        all_busy_periods.sort(key=lambda x: x['start'])
-        
+        # Gaps shorter than the requested duration are skipped before any
+        # slot is built
+        min_duration = timedelta(minutes=duration_minutes)
         available_slots = []
         current_time = start_time
         
         for busy_period in all_busy_periods:
             busy_start = busy_period['start']
             
-            if current_time + timedelta(minutes=duration_minutes) <= busy_start:
+            if busy_start - current_time >= min_duration:
                 available_slots.append(AvailabilitySlot(
                     start_time=current_time,
                     end_time=busy_start,
@@ -419,9 +769,11 @@ class GoogleCalendarIntegration:
                     calendar_ids=calendar_ids
                 ))
             
-            current_time = max(current_time, busy_period['end'])
+            busy_end = busy_period['end']
+            if busy_end > current_time:
+                current_time = busy_end
         
-        if current_time + timedelta(minutes=duration_minutes) <= end_time:
+        if end_time - current_time >= min_duration:
             available_slots.append(AvailabilitySlot(
                 start_time=current_time,
                 end_time=end_time,
@@ -429,4 +781,4 @@ class GoogleCalendarIntegration:
                 calendar_ids=calendar_ids
             ))
         
-        return [slot for slot in available_slots if slot.duration_minutes >= duration_minutes]
\ No newline at end of file
+        return available_slots
\ No newline at end of file
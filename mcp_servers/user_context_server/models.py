@@ -1,5 +1,6 @@
-from pydantic import BaseModel, HttpUrl, Field
+from pydantic import BaseModel, Field
 from typing import Optional, Dict, List, Any, Literal
+from dataclasses import dataclass
 from datetime import datetime
 
 CalendarProvider = Literal["google", "outlook", "apple"]
@@ -8,6 +9,18 @@ AttendeeStatus = Literal["needsAction", "declined", "tentative", "accepted"]
 Visibility = Literal["default", "public", "private", "confidential"]
 RecurrenceType = Literal["daily", "weekly", "monthly", "yearly"]
 
+# Events can carry dozens of attendees, so they are slotted dataclasses
+# rather than per-attendee dicts or models; they still dump as dicts
+@dataclass(slots=True)
+class Attendee:
+    email: str
+    display_name: Optional[str] = None
+    response_status: AttendeeStatus = "needsAction"
+    optional: bool = False
+    resource: bool = False
+    organizer: bool = False
+    comment: Optional[str] = None
+
 class CalendarEvent(BaseModel):
     id: str
     calendar_id: str
@@ -25,11 +38,11 @@ class CalendarEvent(BaseModel):
     updated_at: datetime
     creator_email: Optional[str] = None
     organizer_email: Optional[str] = None
-    attendees: List[Dict[str, Any]] = Field(default_factory=list)
+    attendees: List[Attendee] = Field(default_factory=list)
     recurrence_rules: Optional[List[str]] = None
     original_start_time: Optional[datetime] = None
     recurring_event_id: Optional[str] = None
-    meeting_url: Optional[HttpUrl] = None
+    meeting_url: Optional[str] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 class Calendar(BaseModel):
@@ -43,14 +56,6 @@ class Calendar(BaseModel):
     access_role: Optional[str] = None
     selected: bool = True
 
-class Attendee(BaseModel):
-    email: str
-    display_name: Optional[str] = None
-    response_status: AttendeeStatus = "needsAction"
-    optional: bool = False
-    resource: bool = False
-    organizer: bool = False
-    comment: Optional[str] = None
 
 class FreeBusyQuery(BaseModel):
     calendar_ids: List[str]
@@ -71,6 +76,7 @@ class EventFilters(BaseModel):
     single_events: bool = True
     max_results: int = Field(default=100, ge=1, le=2500)
     order_by: Literal["startTime", "updated"] = "startTime"
+    exclude_all_day: bool = False
 
 class CreateEventRequest(BaseModel):
     calendar_id: str
@@ -99,6 +105,7 @@ class UpdateEventRequest(BaseModel):
     attendees: Optional[List[str]] = None
     visibility: Optional[Visibility] = None
     status: Optional[EventStatus] = None
+    is_all_day: Optional[bool] = None
 
 class EventConflict(BaseModel):
     event_id: str
@@ -1,7 +1,11 @@
 import asyncio
-import json
 import logging
-from typing import Dict, List, Any
+import os
+import time
+import orjson
+from collections import Counter, OrderedDict
+from pydantic import BaseModel, TypeAdapter
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from mcp.server import Server
 from mcp.types import Tool, TextContent
@@ -11,6 +15,7 @@ from mcp.server.lowlevel import NotificationOptions
 
 try:
     # Try relative imports first (when run as module)
+    from ..common import JsonResults, configure_logging
     from .models import (
         CalendarEvent, Calendar, EventFilters, CreateEventRequest, 
         UpdateEventRequest, FreeBusyQuery, EventConflict, AvailabilitySlot
@@ -21,658 +26,743 @@ except ImportError:
     import sys
     from pathlib import Path
     sys.path.append(str(Path(__file__).parent.parent.parent))
+    from mcp_servers.common import JsonResults, configure_logging
     from mcp_servers.user_context_server.models import (
         CalendarEvent, Calendar, EventFilters, CreateEventRequest, 
         UpdateEventRequest, FreeBusyQuery, EventConflict, AvailabilitySlot
     )
     from mcp_servers.user_context_server.integrations.google_calendar import GoogleCalendarIntegration
 
-logging.basicConfig(level=logging.INFO)
+# Log records go to stderr through a queue; stdout carries the JSON-RPC stream
+configure_logging(logging.INFO)
 logger = logging.getLogger(__name__)
 
-print("🚀 Starting MCP User Context Server...")
+def _to_json(obj: Any) -> Any:
+    """orjson fallback: models are dumped as they are reached, anything else is stringified"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    return str(obj)
+
+def _dumps(obj: Any) -> str:
+    """Serialize a tool response to compact JSON text; orjson emits UTF-8 and handles datetimes natively
+
+    Responses hold models directly rather than pre-dumped dicts, so no
+    intermediate list of dicts is built for large event lists.
+    """
+    return orjson.dumps(obj, default=_to_json).decode()
+
+# Calendar lists rarely change and clients list them repeatedly, so the
+# list_calendars response is reused for this many seconds
+CALENDARS_CACHE_TTL = float(os.getenv("MCP_CALENDARS_CACHE_TTL", "300"))
+_calendars_cache: Optional[Tuple[float, Dict]] = None
+
+# Planners often repeat the same event query within a few seconds, so
+# list_events results are kept briefly in a small LRU keyed by the
+# canonical filters. Event writes through this server clear it. Tools
+# whose range is relative to now round it down to the minute, so their
+# repeated calls produce the same key.
+EVENTS_CACHE_TTL = float(os.getenv("MCP_EVENTS_CACHE_TTL", "15"))
+EVENTS_CACHE_MAX_ENTRIES = 64
+_events_cache: "OrderedDict[bytes, Tuple[float, List[CalendarEvent]]]" = OrderedDict()
+
+# Tool arguments carry ISO-8601 timestamps, parsed by ciso8601 when it is
+# installed. Anything it rejects still goes through fromisoformat so the
+# accepted formats do not narrow.
+try:
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:
+    _parse_iso = datetime.fromisoformat
+
+def _parse_dt(value: str) -> datetime:
+    """Parse an ISO-8601 tool argument"""
+    try:
+        return _parse_iso(value)
+    except ValueError:
+        return datetime.fromisoformat(value)
+
 server = Server("user-context-server")
-print("✅ MCP Server instance created")
 
-print("🔧 Initializing Google Calendar integration...")
 try:
     google_calendar = GoogleCalendarIntegration()
-    print("✅ Google Calendar integration initialized")
+    logger.debug("Google Calendar integration initialized")
 except Exception as e:
-    print(f"⚠️ Google Calendar integration failed to initialize: {e}")
-    print("💡 Add GOOGLE_CALENDAR_* env vars to .env file to enable Google Calendar integration")
+    logger.warning(f"Google Calendar integration failed to initialize: {e}. "
+                   "Add GOOGLE_CALENDAR_* env vars to .env file to enable Google Calendar integration")
     google_calendar = None
 
-@server.list_tools()
-async def list_tools() -> List[Tool]:
-    """List available tools for user context and calendar management"""
-    print("📋 Client requested tool list")
-    
-    tools = []
-    
-    if google_calendar:
-        tools.extend([
-            Tool(
-                name="list_calendars",
-                description="List all Google calendars accessible to the user",
-                inputSchema={
-                    "type": "object",
-                    "properties": {},
-                    "required": []
-                }
-            ),
-            Tool(
-                name="list_calendar_events",
-                description="List calendar events with optional filters",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "calendar_ids": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "List of calendar IDs to search (defaults to primary)"
-                        },
-                        "start_time": {
-                            "type": "string",
-                            "description": "ISO-8601 timestamp for start time filter"
-                        },
-                        "end_time": {
-                            "type": "string",
-                            "description": "ISO-8601 timestamp for end time filter"
-                        },
-                        "search_query": {
-                            "type": "string",
-                            "description": "Search query to filter events"
-                        },
-                        "max_results": {
-                            "type": "integer",
-                            "description": "Maximum number of events to return",
-                            "default": 100,
-                            "minimum": 1,
-                            "maximum": 2500
-                        },
-                        "show_deleted": {
-                            "type": "boolean",
-                            "description": "Include deleted events",
-                            "default": False
-                        }
-                    },
-                    "required": []
-                }
-            ),
-            Tool(
-                name="create_calendar_event",
-                description="Create a new calendar event",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "calendar_id": {
-                            "type": "string",
-                            "description": "Calendar ID where to create the event"
-                        },
-                        "title": {
-                            "type": "string",
-                            "description": "Event title/summary"
-                        },
-                        "description": {
-                            "type": "string",
-                            "description": "Event description"
-                        },
-                        "start_time": {
-                            "type": "string",
-                            "description": "ISO-8601 timestamp for event start"
-                        },
-                        "end_time": {
-                            "type": "string",
-                            "description": "ISO-8601 timestamp for event end"
-                        },
-                        "timezone": {
-                            "type": "string",
-                            "description": "Timezone for the event (e.g., 'America/New_York')"
-                        },
-                        "location": {
-                            "type": "string",
-                            "description": "Event location"
-                        },
-                        "attendees": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "List of attendee email addresses"
-                        },
-                        "is_all_day": {
-                            "type": "boolean",
-                            "description": "Whether this is an all-day event",
-                            "default": False
-                        },
-                        "visibility": {
-                            "type": "string",
-                            "enum": ["default", "public", "private", "confidential"],
-                            "description": "Event visibility",
-                            "default": "default"
-                        },
-                        "recurrence_rules": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "Recurrence rules (RRULE format)"
-                        }
-                    },
-                    "required": ["calendar_id", "title", "start_time", "end_time"]
-                }
-            ),
-            Tool(
-                name="update_calendar_event",
-                description="Update an existing calendar event",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "event_id": {
-                            "type": "string",
-                            "description": "Event ID to update"
-                        },
-                        "calendar_id": {
-                            "type": "string",
-                            "description": "Calendar ID containing the event"
-                        },
-                        "title": {
-                            "type": "string",
-                            "description": "New event title"
-                        },
-                        "description": {
-                            "type": "string",
-                            "description": "New event description"
-                        },
-                        "start_time": {
-                            "type": "string",
-                            "description": "New ISO-8601 timestamp for event start"
-                        },
-                        "end_time": {
-                            "type": "string",
-                            "description": "New ISO-8601 timestamp for event end"
-                        },
-                        "timezone": {
-                            "type": "string",
-                            "description": "New timezone for the event"
-                        },
-                        "location": {
-                            "type": "string",
-                            "description": "New event location"
-                        },
-                        "attendees": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "New list of attendee email addresses"
-                        },
-                        "visibility": {
-                            "type": "string",
-                            "enum": ["default", "public", "private", "confidential"],
-                            "description": "New event visibility"
-                        },
-                        "status": {
-                            "type": "string",
-                            "enum": ["confirmed", "tentative", "cancelled"],
-                            "description": "New event status"
-                        }
-                    },
-                    "required": ["event_id", "calendar_id"]
+# Sub-schemas repeated across tools are declared once and shared
+_STRING_ITEMS = {"type": "string"}
+_START_TIME_SCHEMA = {
+    "type": "string",
+    "description": "ISO-8601 timestamp for start time"
+}
+_END_TIME_SCHEMA = {
+    "type": "string",
+    "description": "ISO-8601 timestamp for end time"
+}
+
+def _calendar_ids_schema(description: str) -> Dict[str, Any]:
+    """Schema for a calendar_ids argument"""
+    return {
+        "type": "array",
+        "items": _STRING_ITEMS,
+        "description": description
+    }
+
+# Arguments of one event to create, shared by the single and bulk tools
+_CREATE_EVENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "calendar_id": {
+            "type": "string",
+            "description": "Calendar ID where to create the event"
+        },
+        "title": {
+            "type": "string",
+            "description": "Event title/summary"
+        },
+        "description": {
+            "type": "string",
+            "description": "Event description"
+        },
+        "start_time": {
+            "type": "string",
+            "description": "ISO-8601 timestamp for event start"
+        },
+        "end_time": {
+            "type": "string",
+            "description": "ISO-8601 timestamp for event end"
+        },
+        "timezone": {
+            "type": "string",
+            "description": "Timezone for the event (e.g., 'America/New_York')"
+        },
+        "location": {
+            "type": "string",
+            "description": "Event location"
+        },
+        "attendees": {
+            "type": "array",
+            "items": _STRING_ITEMS,
+            "description": "List of attendee email addresses"
+        },
+        "is_all_day": {
+            "type": "boolean",
+            "description": "Whether this is an all-day event",
+            "default": False
+        },
+        "visibility": {
+            "type": "string",
+            "enum": ["default", "public", "private", "confidential"],
+            "description": "Event visibility",
+            "default": "default"
+        },
+        "recurrence_rules": {
+            "type": "array",
+            "items": _STRING_ITEMS,
+            "description": "Recurrence rules (RRULE format)"
+        }
+    },
+    "required": ["calendar_id", "title", "start_time", "end_time"]
+}
+
+# Tool definitions are static, so they are built once and shared by every
+# tools/list request. Calendar tools are only offered when the integration
+# initialized.
+_TOOLS = [
+    Tool(
+        name="list_calendars",
+        description="List all Google calendars accessible to the user",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    Tool(
+        name="list_calendar_events",
+        description="List calendar events with optional filters",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "calendar_ids": _calendar_ids_schema("List of calendar IDs to search (defaults to primary)"),
+                "start_time": {
+                    "type": "string",
+                    "description": "ISO-8601 timestamp for start time filter"
+                },
+                "end_time": {
+                    "type": "string",
+                    "description": "ISO-8601 timestamp for end time filter"
+                },
+                "search_query": {
+                    "type": "string",
+                    "description": "Search query to filter events"
+                },
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum number of events to return",
+                    "default": 100,
+                    "minimum": 1,
+                    "maximum": 2500
+                },
+                "show_deleted": {
+                    "type": "boolean",
+                    "description": "Include deleted events",
+                    "default": False
                 }
-            ),
-            Tool(
-                name="delete_calendar_event",
-                description="Delete a calendar event",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "calendar_id": {
-                            "type": "string",
-                            "description": "Calendar ID containing the event"
-                        },
-                        "event_id": {
-                            "type": "string",
-                            "description": "Event ID to delete"
-                        }
-                    },
-                    "required": ["calendar_id", "event_id"]
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="create_calendar_event",
+        description="Create a new calendar event",
+        inputSchema=_CREATE_EVENT_SCHEMA
+    ),
+    Tool(
+        name="create_calendar_events",
+        description="Create several calendar events at once, reporting any that failed",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "events": {
+                    "type": "array",
+                    "items": _CREATE_EVENT_SCHEMA,
+                    "description": "Events to create, each with the create_calendar_event arguments"
                 }
-            ),
-            Tool(
-                name="get_calendar_free_busy",
-                description="Get free/busy information for specified calendars",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "calendar_ids": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "List of calendar IDs to check"
-                        },
-                        "start_time": {
-                            "type": "string",
-                            "description": "ISO-8601 timestamp for start time"
-                        },
-                        "end_time": {
-                            "type": "string",
-                            "description": "ISO-8601 timestamp for end time"
-                        }
-                    },
-                    "required": ["calendar_ids", "start_time", "end_time"]
+            },
+            "required": ["events"]
+        }
+    ),
+    Tool(
+        name="update_calendar_event",
+        description="Update an existing calendar event",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "event_id": {
+                    "type": "string",
+                    "description": "Event ID to update"
+                },
+                "calendar_id": {
+                    "type": "string",
+                    "description": "Calendar ID containing the event"
+                },
+                "title": {
+                    "type": "string",
+                    "description": "New event title"
+                },
+                "description": {
+                    "type": "string",
+                    "description": "New event description"
+                },
+                "start_time": {
+                    "type": "string",
+                    "description": "New ISO-8601 timestamp for event start"
+                },
+                "end_time": {
+                    "type": "string",
+                    "description": "New ISO-8601 timestamp for event end"
+                },
+                "timezone": {
+                    "type": "string",
+                    "description": "New timezone for the event"
+                },
+                "location": {
+                    "type": "string",
+                    "description": "New event location"
+                },
+                "attendees": {
+                    "type": "array",
+                    "items": _STRING_ITEMS,
+                    "description": "New list of attendee email addresses"
+                },
+                "visibility": {
+                    "type": "string",
+                    "enum": ["default", "public", "private", "confidential"],
+                    "description": "New event visibility"
+                },
+                "status": {
+                    "type": "string",
+                    "enum": ["confirmed", "tentative", "cancelled"],
+                    "description": "New event status"
+                },
+                "is_all_day": {
+                    "type": "boolean",
+                    "description": "Whether the new start and end times are all-day; looked up from the event when omitted"
                 }
-            ),
-            Tool(
-                name="find_scheduling_conflicts",
-                description="Find scheduling conflicts across calendars within a time range",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "calendar_ids": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "List of calendar IDs to check for conflicts"
-                        },
-                        "start_time": {
-                            "type": "string",
-                            "description": "ISO-8601 timestamp for start time"
-                        },
-                        "end_time": {
-                            "type": "string",
-                            "description": "ISO-8601 timestamp for end time"
-                        }
-                    },
-                    "required": ["calendar_ids", "start_time", "end_time"]
+            },
+            "required": ["event_id", "calendar_id"]
+        }
+    ),
+    Tool(
+        name="delete_calendar_event",
+        description="Delete a calendar event",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "calendar_id": {
+                    "type": "string",
+                    "description": "Calendar ID containing the event"
+                },
+                "event_id": {
+                    "type": "string",
+                    "description": "Event ID to delete"
                 }
-            ),
-            Tool(
-                name="find_available_time_slots",
-                description="Find available time slots for scheduling within a time range",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "calendar_ids": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "List of calendar IDs to check availability"
-                        },
-                        "start_time": {
-                            "type": "string",
-                            "description": "ISO-8601 timestamp for start time"
-                        },
-                        "end_time": {
-                            "type": "string",
-                            "description": "ISO-8601 timestamp for end time"
-                        },
-                        "duration_minutes": {
-                            "type": "integer",
-                            "description": "Minimum duration required in minutes",
-                            "default": 60,
-                            "minimum": 15
-                        }
-                    },
-                    "required": ["calendar_ids", "start_time", "end_time"]
+            },
+            "required": ["calendar_id", "event_id"]
+        }
+    ),
+    Tool(
+        name="get_calendar_free_busy",
+        description="Get free/busy information for specified calendars",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "calendar_ids": _calendar_ids_schema("List of calendar IDs to check"),
+                "start_time": _START_TIME_SCHEMA,
+                "end_time": _END_TIME_SCHEMA
+            },
+            "required": ["calendar_ids", "start_time", "end_time"]
+        }
+    ),
+    Tool(
+        name="find_scheduling_conflicts",
+        description="Find scheduling conflicts across calendars within a time range",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "calendar_ids": _calendar_ids_schema("List of calendar IDs to check for conflicts"),
+                "start_time": _START_TIME_SCHEMA,
+                "end_time": _END_TIME_SCHEMA
+            },
+            "required": ["calendar_ids", "start_time", "end_time"]
+        }
+    ),
+    Tool(
+        name="find_available_time_slots",
+        description="Find available time slots for scheduling within a time range",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "calendar_ids": _calendar_ids_schema("List of calendar IDs to check availability"),
+                "start_time": _START_TIME_SCHEMA,
+                "end_time": _END_TIME_SCHEMA,
+                "duration_minutes": {
+                    "type": "integer",
+                    "description": "Minimum duration required in minutes",
+                    "default": 60,
+                    "minimum": 15
                 }
-            ),
-            Tool(
-                name="get_today_schedule",
-                description="Get today's schedule across all calendars",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "calendar_ids": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "List of calendar IDs to include (defaults to all)"
-                        },
-                        "include_all_day": {
-                            "type": "boolean",
-                            "description": "Include all-day events",
-                            "default": True
-                        }
-                    },
-                    "required": []
+            },
+            "required": ["calendar_ids", "start_time", "end_time"]
+        }
+    ),
+    Tool(
+        name="get_today_schedule",
+        description="Get today's schedule across all calendars",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "calendar_ids": _calendar_ids_schema("List of calendar IDs to include (defaults to all)"),
+                "include_all_day": {
+                    "type": "boolean",
+                    "description": "Include all-day events",
+                    "default": True
                 }
-            ),
-            Tool(
-                name="get_upcoming_events",
-                description="Get upcoming events for the next specified days",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "days_ahead": {
-                            "type": "integer",
-                            "description": "Number of days to look ahead",
-                            "default": 7,
-                            "minimum": 1,
-                            "maximum": 30
-                        },
-                        "calendar_ids": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "List of calendar IDs to include"
-                        },
-                        "max_results": {
-                            "type": "integer",
-                            "description": "Maximum number of events to return",
-                            "default": 50
-                        }
-                    },
-                    "required": []
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="get_upcoming_events",
+        description="Get upcoming events for the next specified days",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "days_ahead": {
+                    "type": "integer",
+                    "description": "Number of days to look ahead",
+                    "default": 7,
+                    "minimum": 1,
+                    "maximum": 30
+                },
+                "calendar_ids": _calendar_ids_schema("List of calendar IDs to include"),
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum number of events to return",
+                    "default": 50
                 }
-            ),
-            Tool(
-                name="analyze_calendar_patterns",
-                description="Analyze calendar patterns and provide insights",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "calendar_ids": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "List of calendar IDs to analyze"
-                        },
-                        "days_back": {
-                            "type": "integer",
-                            "description": "Number of days to look back for analysis",
-                            "default": 30,
-                            "minimum": 1,
-                            "maximum": 90
-                        }
-                    },
-                    "required": []
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="analyze_calendar_patterns",
+        description="Analyze calendar patterns and provide insights",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "calendar_ids": _calendar_ids_schema("List of calendar IDs to analyze"),
+                "days_back": {
+                    "type": "integer",
+                    "description": "Number of days to look back for analysis",
+                    "default": 30,
+                    "minimum": 1,
+                    "maximum": 90
                 }
-            )
-        ])
+            },
+            "required": []
+        }
+    )
+]
+if not google_calendar:
+    _TOOLS = []
+
+@server.list_tools()
+async def list_tools() -> List[Tool]:
+    """List available tools for user context and calendar management"""
+    logger.debug("Client requested tool list")
+    return _TOOLS
+
+# Larger events lists are serialized in a worker thread
+_results = JsonResults(_dumps, "events", offload_threshold=500)
+_wrap_json = _results.wrap_json
+_wrap_result = _results.wrap_result
+
+# Argument models are validated through adapters compiled once at import
+_EVENT_FILTERS = TypeAdapter(EventFilters)
+_CREATE_EVENT_REQUEST = TypeAdapter(CreateEventRequest)
+_UPDATE_EVENT_REQUEST = TypeAdapter(UpdateEventRequest)
+_FREE_BUSY_QUERY = TypeAdapter(FreeBusyQuery)
+
+def _current_minute() -> datetime:
+    """Now, rounded down to the minute so relative ranges share cache keys"""
+    return datetime.now().replace(second=0, microsecond=0)
+
+async def _list_events(filters: EventFilters) -> List[CalendarEvent]:
+    """List events through the short-lived LRU cache"""
+    key = orjson.dumps(filters.model_dump(), option=orjson.OPT_SORT_KEYS)
+    now = time.monotonic()
+    entry = _events_cache.get(key)
+    if entry is not None and entry[0] > now:
+        _events_cache.move_to_end(key)
+        return entry[1]
+    
+    events = await google_calendar.list_events(filters)
+    _events_cache[key] = (now + EVENTS_CACHE_TTL, events)
+    _events_cache.move_to_end(key)
+    if len(_events_cache) > EVENTS_CACHE_MAX_ENTRIES:
+        _events_cache.popitem(last=False)
+    return events
+
+async def _list_calendars(arguments: dict) -> Dict:
+    global _calendars_cache
+    now = time.monotonic()
+    if _calendars_cache is not None and _calendars_cache[0] > now:
+        return _calendars_cache[1]
+    
+    calendars = await google_calendar.list_calendars()
+    result = {
+        "count": len(calendars),
+        "calendars": calendars
+    }
+    _calendars_cache = (now + CALENDARS_CACHE_TTL, result)
+    return result
+
+async def _list_calendar_events(arguments: dict) -> Dict:
+    filters = _EVENT_FILTERS.validate_python({
+        "calendar_ids": arguments.get("calendar_ids"),
+        "start_time": _parse_dt(arguments["start_time"]) if arguments.get("start_time") else None,
+        "end_time": _parse_dt(arguments["end_time"]) if arguments.get("end_time") else None,
+        "search_query": arguments.get("search_query"),
+        "max_results": arguments.get("max_results", 100),
+        "show_deleted": arguments.get("show_deleted", False)
+    })
+    
+    events = await _list_events(filters)
+    
+    return {
+        "count": len(events),
+        "events": events
+    }
+
+def _create_event_request(arguments: dict) -> CreateEventRequest:
+    return _CREATE_EVENT_REQUEST.validate_python({
+        "calendar_id": arguments["calendar_id"],
+        "title": arguments["title"],
+        "description": arguments.get("description"),
+        "start_time": _parse_dt(arguments["start_time"]),
+        "end_time": _parse_dt(arguments["end_time"]),
+        "timezone": arguments.get("timezone"),
+        "location": arguments.get("location"),
+        "attendees": arguments.get("attendees", []),
+        "is_all_day": arguments.get("is_all_day", False),
+        "visibility": arguments.get("visibility", "default"),
+        "recurrence_rules": arguments.get("recurrence_rules")
+    })
+
+async def _create_calendar_event(arguments: dict) -> Dict:
+    request = _create_event_request(arguments)
     
-    return tools
+    event = await google_calendar.create_event(request)
+    _events_cache.clear()
+    
+    return {
+        "success": True,
+        "event": event
+    }
+
+async def _create_calendar_events(arguments: dict) -> Dict:
+    event_requests = [_create_event_request(event_args) for event_args in arguments["events"]]
+    
+    events, failures = await google_calendar.create_events_bulk(event_requests)
+    if events:
+        _events_cache.clear()
+    
+    return {
+        "success": not failures,
+        "count": len(events),
+        "events": events,
+        "failures": failures
+    }
+
+async def _update_calendar_event(arguments: dict) -> Dict:
+    request = _UPDATE_EVENT_REQUEST.validate_python({
+        "event_id": arguments["event_id"],
+        "calendar_id": arguments["calendar_id"],
+        "title": arguments.get("title"),
+        "description": arguments.get("description"),
+        "start_time": _parse_dt(arguments["start_time"]) if arguments.get("start_time") else None,
+        "end_time": _parse_dt(arguments["end_time"]) if arguments.get("end_time") else None,
+        "timezone": arguments.get("timezone"),
+        "location": arguments.get("location"),
+        "attendees": arguments.get("attendees"),
+        "visibility": arguments.get("visibility"),
+        "status": arguments.get("status"),
+        "is_all_day": arguments.get("is_all_day")
+    })
+    
+    event = await google_calendar.update_event(request)
+    _events_cache.clear()
+    
+    return {
+        "success": True,
+        "event": event
+    }
+
+async def _delete_calendar_event(arguments: dict) -> Dict:
+    success = await google_calendar.delete_event(
+        arguments["calendar_id"],
+        arguments["event_id"]
+    )
+    _events_cache.clear()
+    
+    return {
+        "success": success,
+        "message": "Event deleted successfully" if success else "Event not found"
+    }
+
+async def _get_calendar_free_busy(arguments: dict) -> Dict:
+    query = _FREE_BUSY_QUERY.validate_python({
+        "calendar_ids": arguments["calendar_ids"],
+        "start_time": _parse_dt(arguments["start_time"]),
+        "end_time": _parse_dt(arguments["end_time"])
+    })
+    
+    freebusy_data = await google_calendar.get_free_busy(query)
+    
+    # The query is echoed from its already-parsed fields rather than dumped
+    # through pydantic again; orjson formats the datetimes as model_dump did
+    return {
+        "query": {
+            "calendar_ids": query.calendar_ids,
+            "start_time": query.start_time,
+            "end_time": query.end_time
+        },
+        "results": freebusy_data
+    }
+
+async def _find_scheduling_conflicts(arguments: dict) -> Dict:
+    filters = _EVENT_FILTERS.validate_python({
+        "calendar_ids": arguments["calendar_ids"],
+        "start_time": _parse_dt(arguments["start_time"]),
+        "end_time": _parse_dt(arguments["end_time"]),
+        "single_events": True
+    })
+    
+    conflicts = google_calendar.detect_conflicts(await _list_events(filters))
+    
+    return {
+        "conflict_count": len(conflicts),
+        "conflicts": conflicts
+    }
+
+async def _find_available_time_slots(arguments: dict) -> Dict:
+    available_slots = await google_calendar.find_available_slots(
+        arguments["calendar_ids"],
+        _parse_dt(arguments["start_time"]),
+        _parse_dt(arguments["end_time"]),
+        arguments.get("duration_minutes", 60)
+    )
+    
+    return {
+        "slot_count": len(available_slots),
+        "available_slots": available_slots
+    }
+
+# Offset from midnight to the last microsecond of the same day
+_END_OF_DAY = timedelta(days=1, microseconds=-1)
+
+async def _get_today_schedule(arguments: dict) -> Dict:
+    now = datetime.now()
+    today = now.date()
+    start_time = datetime(now.year, now.month, now.day)
+    end_time = start_time + _END_OF_DAY
+    
+    filters = _EVENT_FILTERS.validate_python({
+        "calendar_ids": arguments.get("calendar_ids"),
+        "start_time": start_time,
+        "end_time": end_time,
+        "single_events": True,
+        "order_by": "startTime",
+        "exclude_all_day": not arguments.get("include_all_day", True)
+    })
+    
+    events = await _list_events(filters)
+    
+    return {
+        "date": today.isoformat(),
+        "event_count": len(events),
+        "events": events
+    }
+
+async def _get_upcoming_events(arguments: dict) -> Dict:
+    days_ahead = arguments.get("days_ahead", 7)
+    start_time = _current_minute()
+    end_time = start_time + timedelta(days=days_ahead)
+    
+    filters = _EVENT_FILTERS.validate_python({
+        "calendar_ids": arguments.get("calendar_ids"),
+        "start_time": start_time,
+        "end_time": end_time,
+        "max_results": arguments.get("max_results", 50),
+        "single_events": True,
+        "order_by": "startTime"
+    })
+    
+    events = await _list_events(filters)
+    
+    return {
+        "time_range": {
+            "start": start_time.isoformat(),
+            "end": end_time.isoformat(),
+            "days_ahead": days_ahead
+        },
+        "event_count": len(events),
+        "events": events
+    }
+
+async def _analyze_calendar_patterns(arguments: dict) -> Dict:
+    days_back = arguments.get("days_back", 30)
+    end_time = _current_minute()
+    start_time = end_time - timedelta(days=days_back)
+    
+    filters = _EVENT_FILTERS.validate_python({
+        "calendar_ids": arguments.get("calendar_ids"),
+        "start_time": start_time,
+        "end_time": end_time,
+        "max_results": 2500,
+        "single_events": True
+    })
+    
+    events = await _list_events(filters)
+    
+    analysis = await _analyze_events(events, days_back)
+    
+    return {
+        "analysis_period": {
+            "start": start_time.isoformat(),
+            "end": end_time.isoformat(),
+            "days_analyzed": days_back
+        },
+        "total_events": len(events),
+        "patterns": analysis
+    }
+
+# Tool name -> handler, built once so dispatch is a single dict lookup
+HANDLERS = {
+    "list_calendars": _list_calendars,
+    "list_calendar_events": _list_calendar_events,
+    "create_calendar_event": _create_calendar_event,
+    "create_calendar_events": _create_calendar_events,
+    "update_calendar_event": _update_calendar_event,
+    "delete_calendar_event": _delete_calendar_event,
+    "get_calendar_free_busy": _get_calendar_free_busy,
+    "find_scheduling_conflicts": _find_scheduling_conflicts,
+    "find_available_time_slots": _find_available_time_slots,
+    "get_today_schedule": _get_today_schedule,
+    "get_upcoming_events": _get_upcoming_events,
+    "analyze_calendar_patterns": _analyze_calendar_patterns,
+}
 
 @server.call_tool()
 async def call_tool(name: str, arguments: dict) -> List[TextContent]:
     """Handle tool calls"""
-    print(f"🔧 Client called tool: {name} with args: {arguments}")
+    logger.debug("Client called tool %s with args %s", name, arguments)
     
     try:
         if not google_calendar:
-            return [TextContent(
-                type="text",
-                text=json.dumps({"error": "Google Calendar integration not available"})
-            )]
-        
-        if name == "list_calendars":
-            calendars = await google_calendar.list_calendars()
-            return [TextContent(
-                type="text",
-                text=json.dumps({
-                    "count": len(calendars),
-                    "calendars": [cal.model_dump() for cal in calendars]
-                }, default=str)
-            )]
-        
-        elif name == "list_calendar_events":
-            filters = EventFilters(
-                calendar_ids=arguments.get("calendar_ids"),
-                start_time=datetime.fromisoformat(arguments["start_time"]) if arguments.get("start_time") else None,
-                end_time=datetime.fromisoformat(arguments["end_time"]) if arguments.get("end_time") else None,
-                search_query=arguments.get("search_query"),
-                max_results=arguments.get("max_results", 100),
-                show_deleted=arguments.get("show_deleted", False)
-            )
-            
-            events = await google_calendar.list_events(filters)
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps({
-                    "count": len(events),
-                    "events": [event.model_dump() for event in events]
-                }, default=str)
-            )]
-        
-        elif name == "create_calendar_event":
-            request = CreateEventRequest(
-                calendar_id=arguments["calendar_id"],
-                title=arguments["title"],
-                description=arguments.get("description"),
-                start_time=datetime.fromisoformat(arguments["start_time"]),
-                end_time=datetime.fromisoformat(arguments["end_time"]),
-                timezone=arguments.get("timezone"),
-                location=arguments.get("location"),
-                attendees=arguments.get("attendees", []),
-                is_all_day=arguments.get("is_all_day", False),
-                visibility=arguments.get("visibility", "default"),
-                recurrence_rules=arguments.get("recurrence_rules")
-            )
-            
-            event = await google_calendar.create_event(request)
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps({
-                    "success": True,
-                    "event": event.model_dump()
-                }, default=str)
-            )]
-        
-        elif name == "update_calendar_event":
-            request = UpdateEventRequest(
-                event_id=arguments["event_id"],
-                calendar_id=arguments["calendar_id"],
-                title=arguments.get("title"),
-                description=arguments.get("description"),
-                start_time=datetime.fromisoformat(arguments["start_time"]) if arguments.get("start_time") else None,
-                end_time=datetime.fromisoformat(arguments["end_time"]) if arguments.get("end_time") else None,
-                timezone=arguments.get("timezone"),
-                location=arguments.get("location"),
-                attendees=arguments.get("attendees"),
-                visibility=arguments.get("visibility"),
-                status=arguments.get("status")
-            )
-            
-            event = await google_calendar.update_event(request)
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps({
-                    "success": True,
-                    "event": event.model_dump()
-                }, default=str)
-            )]
-        
-        elif name == "delete_calendar_event":
-            success = await google_calendar.delete_event(
-                arguments["calendar_id"],
-                arguments["event_id"]
-            )
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps({
-                    "success": success,
-                    "message": "Event deleted successfully" if success else "Event not found"
-                })
-            )]
-        
-        elif name == "get_calendar_free_busy":
-            query = FreeBusyQuery(
-                calendar_ids=arguments["calendar_ids"],
-                start_time=datetime.fromisoformat(arguments["start_time"]),
-                end_time=datetime.fromisoformat(arguments["end_time"])
-            )
-            
-            freebusy_data = await google_calendar.get_free_busy(query)
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps({
-                    "query": query.model_dump(),
-                    "results": [fb.model_dump() for fb in freebusy_data]
-                }, default=str)
-            )]
-        
-        elif name == "find_scheduling_conflicts":
-            conflicts = await google_calendar.find_conflicts(
-                arguments["calendar_ids"],
-                datetime.fromisoformat(arguments["start_time"]),
-                datetime.fromisoformat(arguments["end_time"])
-            )
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps({
-                    "conflict_count": len(conflicts),
-                    "conflicts": [conflict.model_dump() for conflict in conflicts]
-                }, default=str)
-            )]
-        
-        elif name == "find_available_time_slots":
-            available_slots = await google_calendar.find_available_slots(
-                arguments["calendar_ids"],
-                datetime.fromisoformat(arguments["start_time"]),
-                datetime.fromisoformat(arguments["end_time"]),
-                arguments.get("duration_minutes", 60)
-            )
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps({
-                    "slot_count": len(available_slots),
-                    "available_slots": [slot.model_dump() for slot in available_slots]
-                }, default=str)
-            )]
-        
-        elif name == "get_today_schedule":
-            today = datetime.now().date()
-            start_time = datetime.combine(today, datetime.min.time())
-            end_time = datetime.combine(today, datetime.max.time())
-            
-            filters = EventFilters(
-                calendar_ids=arguments.get("calendar_ids"),
-                start_time=start_time,
-                end_time=end_time,
-                single_events=True,
-                order_by="startTime"
-            )
-            
-            events = await google_calendar.list_events(filters)
-            
-            if not arguments.get("include_all_day", True):
-                events = [e for e in events if not e.is_all_day]
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps({
-                    "date": today.isoformat(),
-                    "event_count": len(events),
-                    "events": [event.model_dump() for event in events]
-                }, default=str)
-            )]
+            return _wrap_json({"error": "Google Calendar integration not available"})
         
-        elif name == "get_upcoming_events":
-            days_ahead = arguments.get("days_ahead", 7)
-            start_time = datetime.now()
-            end_time = start_time + timedelta(days=days_ahead)
-            
-            filters = EventFilters(
-                calendar_ids=arguments.get("calendar_ids"),
-                start_time=start_time,
-                end_time=end_time,
-                max_results=arguments.get("max_results", 50),
-                single_events=True,
-                order_by="startTime"
-            )
-            
-            events = await google_calendar.list_events(filters)
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps({
-                    "time_range": {
-                        "start": start_time.isoformat(),
-                        "end": end_time.isoformat(),
-                        "days_ahead": days_ahead
-                    },
-                    "event_count": len(events),
-                    "events": [event.model_dump() for event in events]
-                }, default=str)
-            )]
-        
-        elif name == "analyze_calendar_patterns":
-            days_back = arguments.get("days_back", 30)
-            end_time = datetime.now()
-            start_time = end_time - timedelta(days=days_back)
-            
-            filters = EventFilters(
-                calendar_ids=arguments.get("calendar_ids"),
-                start_time=start_time,
-                end_time=end_time,
-                max_results=2500,
-                single_events=True
-            )
-            
-            events = await google_calendar.list_events(filters)
-            
-            analysis = await _analyze_events(events, days_back)
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps({
-                    "analysis_period": {
-                        "start": start_time.isoformat(),
-                        "end": end_time.isoformat(),
-                        "days_analyzed": days_back
-                    },
-                    "total_events": len(events),
-                    "patterns": analysis
-                }, default=str)
-            )]
-        
-        else:
+        handler = HANDLERS.get(name)
+        if handler is None:
             raise ValueError(f"Unknown tool: {name}")
+        return await _wrap_result(await handler(arguments))
             
     except Exception as e:
         logger.error(f"Error calling tool {name}: {e}")
-        return [TextContent(
-            type="text",
-            text=json.dumps({
-                "error": str(e),
-                "tool": name,
-                "arguments": arguments
-            })
-        )]
+        return _wrap_json({
+            "error": str(e),
+            "tool": name,
+            "arguments": arguments
+        })
 
 async def _analyze_events(events: List[CalendarEvent], days_back: int) -> Dict[str, Any]:
     """Analyze calendar events for patterns and insights"""
     if not events:
         return {"message": "No events found in the specified period"}
     
-    daily_counts = {}
+    # Days are counted as date objects and formatted once per distinct day
+    # rather than once per event
+    day_counts = Counter()
     hourly_distribution = [0] * 24
     event_durations = []
-    attendee_counts = []
-    location_counts = {}
-    organizer_counts = {}
+    total_attendees = 0
+    location_counts = Counter()
+    organizer_counts = Counter()
     
     for event in events:
-        event_date = event.start_time.date().isoformat()
-        daily_counts[event_date] = daily_counts.get(event_date, 0) + 1
-        
-        hour = event.start_time.hour
-        hourly_distribution[hour] += 1
-        
-        duration_minutes = int((event.end_time - event.start_time).total_seconds() / 60)
-        event_durations.append(duration_minutes)
-        
-        attendee_counts.append(len(event.attendees))
+        start_time = event.start_time
+        day_counts[start_time.date()] += 1
+        hourly_distribution[start_time.hour] += 1
+        event_durations.append(int((event.end_time - start_time).total_seconds() / 60))
+        total_attendees += len(event.attendees)
         
         if event.location:
-            location_counts[event.location] = location_counts.get(event.location, 0) + 1
+            location_counts[event.location] += 1
         
         if event.organizer_email:
-            organizer_counts[event.organizer_email] = organizer_counts.get(event.organizer_email, 0) + 1
+            organizer_counts[event.organizer_email] += 1
     
+    daily_counts = {day.isoformat(): count for day, count in day_counts.items()}
     avg_events_per_day = len(events) / days_back
     avg_duration = sum(event_durations) / len(event_durations) if event_durations else 0
-    avg_attendees = sum(attendee_counts) / len(attendee_counts) if attendee_counts else 0
+    avg_attendees = total_attendees / len(events)
     
     busiest_hour = hourly_distribution.index(max(hourly_distribution))
-    top_locations = sorted(location_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-    top_organizers = sorted(organizer_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+    top_locations = location_counts.most_common(5)
+    top_organizers = organizer_counts.most_common(5)
     
     return {
         "summary": {
@@ -697,24 +787,24 @@ async def _analyze_events(events: List[CalendarEvent], days_back: int) -> Dict[s
 
 async def run():
     """Run the server with lifespan management."""
-    print("🌐 Starting stdio server...")
-    
     async with stdio_server() as (read_stream, write_stream):
-        print("📡 MCP User Context Server running and listening for client connections...")
-        print("💡 Server is ready to process calendar requests!")
-        print("⏳ Waiting for MCP client to connect...")
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="user-context-server",
-                server_version="0.1.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
+        logger.info("User context server listening on stdio")
+        try:
+            await server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="user-context-server",
+                    server_version="0.1.0",
+                    capabilities=server.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={},
+                    ),
                 ),
-            ),
-        )
+            )
+        finally:
+            if google_calendar:
+                google_calendar.close()
 
 if __name__ == "__main__":
     asyncio.run(run())
\ No newline at end of file
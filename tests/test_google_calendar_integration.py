@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+Tests for the Google Calendar integration used by the user context MCP server
+"""
+
+import os
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+
+def make_event(event_id, start, end, **extra):
+    """Minimal Google Calendar event resource"""
+    return {
+        "id": event_id,
+        "summary": f"Event {event_id}",
+        "start": {"dateTime": start},
+        "end": {"dateTime": end},
+        "created": "2024-01-01T00:00:00Z",
+        "updated": "2024-01-01T00:00:00Z",
+        **extra
+    }
+
+
+class TestGoogleCalendarIntegrationUnit:
+    """Unit tests for Google Calendar integration without hitting the Google APIs"""
+
+    @pytest.fixture
+    def calendar_module(self):
+        """The integration module with dummy credentials and an empty token cache"""
+        from mcp_servers.user_context_server.integrations import google_calendar
+        settings = ("test_refresh_token", "test_client_id", "test_client_secret")
+        with patch.object(google_calendar, "_client_settings", return_value=settings), \
+             patch.object(google_calendar, "_CREDENTIALS", None):
+            google_calendar._TOKEN_CACHE.clear()
+            google_calendar._SERVICES.__dict__.clear()
+            yield google_calendar
+            google_calendar._TOKEN_CACHE.clear()
+            google_calendar._SERVICES.__dict__.clear()
+
+    @pytest.fixture
+    def integration(self, calendar_module):
+        """Integration whose service is a mock, bypassing OAuth"""
+        service = MagicMock()
+        with patch.object(calendar_module.GoogleCalendarIntegration, "_get_service", return_value=service):
+            integration = calendar_module.GoogleCalendarIntegration()
+            integration.service = service
+            yield integration
+
+    @pytest.mark.asyncio
+    async def test_list_events_batches_calendars(self, calendar_module, integration):
+        """Several calendars are listed in one batch request, keeping calendar order"""
+        items = {
+            "primary": [make_event("a", "2024-01-02T09:00:00Z", "2024-01-02T10:00:00Z")],
+            "team": [make_event("b", "2024-01-02T11:00:00Z", "2024-01-02T12:00:00Z")],
+            "broken": None,
+        }
+        batches = []
+
+        class FakeBatch:
+            def __init__(self, callback):
+                self.callback = callback
+                self.requests = []
+
+            def add(self, request, request_id):
+                self.requests.append((request_id, request))
+
+            def execute(self):
+                batches.append([request_id for request_id, _ in self.requests])
+                # Responses may arrive in any order
+                for request_id, calendar_id in reversed(self.requests):
+                    if items[calendar_id] is None:
+                        self.callback(request_id, None, Exception("notFound"))
+                    else:
+                        self.callback(request_id, {"items": items[calendar_id]}, None)
+
+        service = integration.service
+        service.new_batch_http_request.side_effect = lambda callback: FakeBatch(callback)
+        service.events().list.side_effect = lambda **params: params["calendarId"]
+
+        events = await integration.list_events(
+            calendar_module.EventFilters(calendar_ids=["primary", "broken", "team"])
+        )
+
+        assert batches == [["0", "1", "2"]]
+        assert [(e.id, e.calendar_id) for e in events] == [("a", "primary"), ("b", "team")]
+        assert service.events().list.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_create_events_bulk_reports_failed_chunks(self, calendar_module, integration):
+        """A failing batch is reported per request without losing earlier chunks"""
+        from googleapiclient.errors import HttpError
+
+        class FakeBatch:
+            def __init__(self, callback):
+                self.callback = callback
+                self.request_ids = []
+
+            def add(self, request, request_id):
+                self.request_ids.append(request_id)
+
+            def execute(self):
+                if "2" in self.request_ids:
+                    raise HttpError(MagicMock(status=503), b"")
+                for request_id in self.request_ids:
+                    if request_id == "1":
+                        self.callback(request_id, None, Exception("forbidden"))
+                    else:
+                        start = "2024-01-02T09:00:00Z"
+                        self.callback(request_id, make_event(f"e{request_id}", start, start), None)
+
+        service = integration.service
+        service.new_batch_http_request.side_effect = lambda callback: FakeBatch(callback)
+        start = datetime(2024, 1, 2, 9)
+        requests = [
+            calendar_module.CreateEventRequest(
+                calendar_id="primary", title=f"Event {i}", start_time=start, end_time=start + timedelta(hours=1)
+            )
+            for i in range(3)
+        ]
+
+        with patch.object(calendar_module, "CALENDAR_BATCH_SIZE", 2):
+            events, failures = await integration.create_events_bulk(requests)
+
+        assert [event.id for event in events] == ["e0"]
+        assert [(f["index"], f["title"]) for f in failures] == [(1, "Event 1"), (2, "Event 2")]
+        assert failures[0]["error"] == "forbidden"
+
+    @pytest.mark.asyncio
+    async def test_create_events_bulk_reports_unreadable_created_events(self, calendar_module, integration):
+        """A created event that fails conversion is reported with its id instead of aborting"""
+
+        class FakeBatch:
+            def __init__(self, callback):
+                self.callback = callback
+                self.request_ids = []
+
+            def add(self, request, request_id):
+                self.request_ids.append(request_id)
+
+            def execute(self):
+                start = "2024-01-02T09:00:00Z"
+                self.callback("0", make_event("e0", start, start), None)
+                self.callback("1", {"id": "e1", "start": {}}, None)
+
+        integration.service.new_batch_http_request.side_effect = lambda callback: FakeBatch(callback)
+        start = datetime(2024, 1, 2, 9)
+        requests = [
+            calendar_module.CreateEventRequest(
+                calendar_id="primary", title=f"Event {i}", start_time=start, end_time=start + timedelta(hours=1)
+            )
+            for i in range(2)
+        ]
+
+        events, failures = await integration.create_events_bulk(requests)
+
+        assert [event.id for event in events] == ["e0"]
+        assert len(failures) == 1
+        assert failures[0]["index"] == 1
+        assert failures[0]["created_event_id"] == "e1"
+
+    @pytest.mark.asyncio
+    async def test_list_events_follows_page_tokens(self, calendar_module, integration):
+        """Short pages are followed until max_results events are collected"""
+        pages = {
+            None: {"items": [make_event("a", "2024-01-02T09:00:00Z", "2024-01-02T10:00:00Z")], "nextPageToken": "p2"},
+            "p2": {"items": [], "nextPageToken": "p3"},
+            "p3": {"items": [make_event("b", "2024-01-02T11:00:00Z", "2024-01-02T12:00:00Z"),
+                             make_event("c", "2024-01-02T13:00:00Z", "2024-01-02T14:00:00Z")],
+                   "nextPageToken": "p4"},
+        }
+        tokens = []
+
+        def fake_list(**params):
+            tokens.append(params.get("pageToken"))
+            return MagicMock(execute=MagicMock(return_value=pages[params.get("pageToken")]))
+
+        integration.service.events().list.side_effect = fake_list
+
+        events = await integration.list_events(calendar_module.EventFilters(max_results=2))
+
+        assert [e.id for e in events] == ["a", "b"]
+        assert tokens == [None, "p2", "p3"]
+
+    @pytest.mark.asyncio
+    async def test_list_events_can_exclude_all_day(self, calendar_module, integration):
+        """All-day items are dropped before conversion when the filters ask for it"""
+        integration.service.events().list.return_value.execute.return_value = {"items": [
+            make_event("a", "2024-01-02T09:00:00Z", "2024-01-02T10:00:00Z"),
+            {**make_event("b", None, None), "start": {"date": "2024-01-02"}, "end": {"date": "2024-01-03"}},
+        ]}
+
+        everything = await integration.list_events(calendar_module.EventFilters())
+        timed = await integration.list_events(calendar_module.EventFilters(exclude_all_day=True))
+
+        assert [e.id for e in everything] == ["a", "b"]
+        assert [e.id for e in timed] == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_find_conflicts_matches_pairwise_scan(self, calendar_module, integration):
+        """The sweep reports the same conflicts, in the same order, as comparing every pair"""
+        import random
+        rng = random.Random(7)
+        base = datetime(2024, 1, 2, 8)
+        events = []
+        for index in range(60):
+            start = base + timedelta(minutes=15 * rng.randrange(40))
+            end = start + timedelta(minutes=15 * rng.randrange(0, 8))
+            events.append(integration._convert_to_calendar_event(
+                make_event(str(index), start.isoformat() + "Z", end.isoformat() + "Z"), "primary"
+            ))
+
+        expected = [
+            (event1.id, integration._get_overlap_duration(event1, event2))
+            for i, event1 in enumerate(events)
+            for event2 in events[i + 1:]
+            if integration._events_conflict(event1, event2)
+        ]
+
+        with patch.object(integration, "list_events", return_value=events):
+            conflicts = await integration.find_conflicts(["primary"], base, base + timedelta(days=1))
+
+        assert expected
+        assert [(c.event_id, c.duration_minutes) for c in conflicts] == expected
+
+    @pytest.mark.asyncio
+    async def test_find_available_slots_merges_calendars(self, calendar_module, integration):
+        """Busy periods from every calendar are merged and short gaps are dropped"""
+        day = datetime(2024, 1, 2, 9)
+        hours = lambda h: day + timedelta(hours=h)
+        freebusy = [
+            calendar_module.FreeBusyResponse(calendar_id="primary", busy_periods=[
+                {"start": hours(0), "end": hours(1)},
+                {"start": hours(3), "end": hours(4)},
+            ]),
+            calendar_module.FreeBusyResponse(calendar_id="team", busy_periods=[
+                {"start": hours(0.5), "end": hours(1.5)},
+                {"start": hours(1.75), "end": hours(2)},
+            ]),
+        ]
+
+        with patch.object(integration, "get_free_busy", return_value=freebusy):
+            slots = await integration.find_available_slots(["primary", "team"], hours(0), hours(8), 60)
+
+        assert [(s.start_time, s.end_time, s.duration_minutes) for s in slots] == [
+            (hours(2), hours(3), 60),
+            (hours(4), hours(8), 240),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_list_calendars_revalidates_with_etag(self, calendar_module, integration):
+        """An unchanged calendar list is served from cache on a 304"""
+        from googleapiclient.errors import HttpError
+        sent_headers = []
+
+        def fake_execute(headers):
+            sent_headers.append(dict(headers))
+            if headers.get("If-None-Match") == '"v1"':
+                raise HttpError(MagicMock(status=304), b"")
+            return {"etag": '"v1"', "items": [{"id": "primary", "summary": "Me", "primary": True}]}
+
+        def fake_list(**params):
+            request = MagicMock(headers={})
+            request.execute.side_effect = lambda: fake_execute(request.headers)
+            return request
+
+        integration.service.calendarList().list.side_effect = fake_list
+
+        first = await integration.list_calendars()
+        second = await integration.list_calendars()
+        assert [c.id for c in first] == [c.id for c in second] == ["primary"]
+        assert sent_headers == [{}, {"If-None-Match": '"v1"'}]
+
+        # Once the server's response cache has expired the list is still revalidated
+        etag, calendars, fetched = integration._calendar_list_cache
+        integration._calendar_list_cache = (etag, calendars, fetched - 301)
+        await integration.list_calendars()
+        assert sent_headers[-1] == {"If-None-Match": '"v1"'}
+
+        # Past the ETag TTL the list is fetched unconditionally again
+        etag, calendars, fetched = integration._calendar_list_cache
+        integration._calendar_list_cache = (etag, calendars, fetched - calendar_module.CALENDAR_LIST_ETAG_TTL)
+        await integration.list_calendars()
+        assert sent_headers[-1] == {}
+
+    @pytest.mark.asyncio
+    async def test_update_event_patches_changed_fields(self, calendar_module, integration):
+        """Updates send a partial patch and only read the event when its all-day shape is unknown"""
+        events = integration.service.events()
+        events.patch.return_value.execute.return_value = make_event(
+            "a", "2024-01-02T09:00:00Z", "2024-01-02T10:00:00Z", summary="Renamed"
+        )
+        events.get.return_value.execute.return_value = {"start": {"date": "2024-01-02"}}
+
+        event = await integration.update_event(calendar_module.UpdateEventRequest(
+            event_id="a", calendar_id="primary", title="Renamed"
+        ))
+        assert event.title == "Renamed"
+        assert events.patch.call_args.kwargs["body"] == {"summary": "Renamed"}
+        events.get.assert_not_called()
+
+        await integration.update_event(calendar_module.UpdateEventRequest(
+            event_id="a", calendar_id="primary",
+            start_time=datetime(2024, 1, 3), end_time=datetime(2024, 1, 4)
+        ))
+        assert events.get.call_count == 1
+        assert events.patch.call_args.kwargs["body"] == {
+            "start": {"date": "2024-01-03", "dateTime": None},
+            "end": {"date": "2024-01-04", "dateTime": None},
+        }
+
+        await integration.update_event(calendar_module.UpdateEventRequest(
+            event_id="a", calendar_id="primary", is_all_day=False, timezone="Europe/Paris",
+            start_time=datetime(2024, 1, 3, 9), end_time=datetime(2024, 1, 3, 10)
+        ))
+        assert events.get.call_count == 1
+        assert events.patch.call_args.kwargs["body"]["start"] == {
+            "dateTime": "2024-01-03T09:00:00", "timeZone": "Europe/Paris", "date": None
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_free_busy_runs_off_the_event_loop(self, calendar_module, integration):
+        """The free/busy query runs in a worker thread and keeps calendar order"""
+        import threading
+        threads = []
+
+        def fake_execute():
+            threads.append(threading.current_thread())
+            return {"calendars": {
+                "team": {"busy": [{"start": "2024-01-02T09:00:00Z", "end": "2024-01-02T10:00:00Z"}]},
+                "primary": {"errors": [{"reason": "notFound"}]},
+            }}
+
+        integration.service.freebusy().query.return_value.execute.side_effect = fake_execute
+
+        results = await integration.get_free_busy(calendar_module.FreeBusyQuery(
+            calendar_ids=["primary", "team"],
+            start_time=datetime(2024, 1, 2), end_time=datetime(2024, 1, 3)
+        ))
+
+        assert threads and threads[0] is not threading.current_thread()
+        assert [(r.calendar_id, len(r.busy_periods), r.errors) for r in results] == [
+            ("primary", 0, ["notFound"]), ("team", 1, []),
+        ]
+
+    def test_convert_event_skips_validation_unless_strict(self, calendar_module, integration):
+        """API events are built without validation, which strict mode restores"""
+        event_data = make_event("a", "2024-01-02T09:00:00Z", "2024-01-02T10:00:00Z",
+                                status="unexpected", hangoutLink="https://meet.google.com/abc")
+
+        event = integration._convert_to_calendar_event(event_data, "primary")
+        assert event.status == "unexpected"
+        assert event.meeting_url == "https://meet.google.com/abc"
+        assert event.start_time == datetime(2024, 1, 2, 9, tzinfo=event.start_time.tzinfo)
+
+        with patch.object(calendar_module, "STRICT_VALIDATION", True):
+            with pytest.raises(ValueError):
+                integration._convert_to_calendar_event(event_data, "primary")
+
+    def test_convert_event_meeting_url_sources(self, calendar_module, integration):
+        """The meeting URL falls back to conference data and tolerates missing entry points"""
+        convert = lambda **extra: integration._convert_to_calendar_event(
+            make_event("a", "2024-01-02T09:00:00Z", "2024-01-02T10:00:00Z", **extra), "primary"
+        )
+
+        assert convert().meeting_url is None
+        assert convert(conferenceData={"entryPoints": []}).meeting_url is None
+        assert convert(conferenceData={"entryPoints": [{"uri": "https://zoom.us/j/1"}]}).meeting_url == "https://zoom.us/j/1"
+        assert convert(hangoutLink="https://meet.google.com/abc",
+                       conferenceData={"entryPoints": [{"uri": "https://zoom.us/j/1"}]}).meeting_url == "https://meet.google.com/abc"
+
+    def test_convert_event_builds_slotted_attendees(self, calendar_module, integration):
+        """Attendees become slotted Attendee records rather than dicts"""
+        event_data = make_event("a", "2024-01-02T09:00:00Z", "2024-01-02T10:00:00Z", attendees=[
+            {"email": "room@example.com", "resource": True, "responseStatus": "accepted"},
+            {"email": "guest@example.com", "optional": True, "comment": "Might be late"},
+        ])
+
+        event = integration._convert_to_calendar_event(event_data, "primary")
+
+        assert all(isinstance(a, calendar_module.Attendee) for a in event.attendees)
+        assert not hasattr(event.attendees[0], "__dict__")
+        assert (event.attendees[0].resource, event.attendees[0].response_status) == (True, "accepted")
+        assert event.attendees[1].comment == "Might be late"
+        assert event.model_dump()["attendees"][1]["optional"] is True
+
+    def test_client_settings_load_dotenv_once(self):
+        """.env is read on the first mint rather than at import, and only once"""
+        from mcp_servers.user_context_server.integrations import google_calendar
+        google_calendar._client_settings.cache_clear()
+        try:
+            with patch.object(google_calendar, "load_dotenv") as load_dotenv, \
+                 patch.dict(os.environ, {"GOOGLE_CALENDAR_CLIENT_ID": "cid"}):
+                os.environ.pop("SKIP_DOTENV", None)
+                assert google_calendar._client_settings()[1] == "cid"
+                google_calendar._client_settings()
+                assert load_dotenv.call_count == 1
+
+                google_calendar._client_settings.cache_clear()
+                os.environ["SKIP_DOTENV"] = "1"
+                google_calendar._client_settings()
+                assert load_dotenv.call_count == 1
+        finally:
+            google_calendar._client_settings.cache_clear()
+
+    def test_response_model_decodes_like_stdlib_json(self, calendar_module):
+        """The orjson response model matches json.loads, including on bodies orjson rejects"""
+        import json
+        model = calendar_module._RESPONSE_MODEL
+        bodies = [
+            '{"items": [{"summary": "Launch \U0001F680 caf\u00e9"}]}'.encode("utf-8"),
+            b'{"items": [{"summary": "\\ud83d\\ude80 escaped"}]}',
+            b'{"items": [{"summary": "lone \\ud83d surrogate"}]}',
+        ]
+
+        for body in bodies:
+            assert model.deserialize(body) == json.loads(body)
+
+    def test_access_token_cached_until_near_expiry(self, calendar_module):
+        """Instances share one minted token and service until the token is about to expire"""
+        refreshes = []
+
+        def fake_refresh(creds, request):
+            refreshes.append(request)
+            creds.token = f"token-{len(refreshes)}"
+            creds.expiry = datetime.utcnow() + timedelta(hours=1)
+
+        with patch.object(calendar_module.Credentials, "refresh", autospec=True, side_effect=fake_refresh), \
+             patch.object(calendar_module, "build", side_effect=lambda *args, **kwargs: MagicMock()) as build:
+            first = calendar_module.GoogleCalendarIntegration()
+            second = calendar_module.GoogleCalendarIntegration()
+            assert first.service is second.service
+            assert len(refreshes) == 1
+            assert build.call_count == 1
+            assert build.call_args.kwargs["model"] is calendar_module._RESPONSE_MODEL
+
+            # A token inside the expiry skew is refreshed and the service rebuilt
+            calendar_module._TOKEN_CACHE["test_client_id"] = ("token-1", datetime.utcnow() + timedelta(seconds=30))
+            assert first._get_service() is not second.service
+            assert len(refreshes) == 2
+            assert build.call_count == 2
+            # Both refreshes reused the one Credentials object and token session
+            assert calendar_module._CREDENTIALS.token == "token-2"
+            assert refreshes == [calendar_module._TOKEN_REQUEST] * 2
+
+    def test_close_releases_shared_clients(self, calendar_module):
+        """close() shuts this thread's shared service and the token session"""
+        service = MagicMock()
+        calendar_module._SERVICES.service = service
+        calendar_module._SERVICES.token = "token"
+        integration = calendar_module.GoogleCalendarIntegration.__new__(calendar_module.GoogleCalendarIntegration)
+        integration.service = service
+
+        with patch.object(calendar_module._TOKEN_SESSION, "close") as close_session:
+            integration.close()
+
+        service.close.assert_called_once()
+        close_session.assert_called_once()
+        assert integration.service is None
+        assert not hasattr(calendar_module._SERVICES, "service")
+
+    def test_missing_client_settings_fail_on_mint(self, calendar_module):
+        """Missing OAuth settings surface when minting, not at import"""
+        with patch.object(calendar_module, "_client_settings", return_value=("token", "client", None)):
+            integration = calendar_module.GoogleCalendarIntegration()
+            assert integration.service is None
+            with pytest.raises(RuntimeError, match="Missing env"):
+                integration._mint_access_token()
@@ -6,7 +6,10 @@ This script tests the basic functionality without requiring actual Google Calend
 
 import sys
 import os
+import json
+import pytest
 from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
 
 sys.path.append(str(Path(__file__).parent))
 
@@ -127,6 +130,178 @@ def test_tool_definitions():
     
     return True
 
+@pytest.fixture
+def server():
+    """The server module with a mocked calendar integration and empty caches"""
+    from mcp_servers.user_context_server import server
+    calendar = MagicMock()
+    calendar.list_events = AsyncMock(return_value=[])
+    calendar.detect_conflicts = MagicMock(return_value=[])
+    with patch.object(server, "google_calendar", calendar), patch.object(server, "_calendars_cache", None):
+        server._events_cache.clear()
+        yield server
+        server._events_cache.clear()
+
+
+def make_event(event_id, start):
+    """A CalendarEvent one hour long"""
+    now = datetime(2024, 1, 1)
+    return CalendarEvent(
+        id=event_id, calendar_id="primary", provider="google", title=f"Event {event_id}",
+        start_time=start, end_time=start + timedelta(hours=1), created_at=now, updated_at=now
+    )
+
+
+class TestToolHandlers:
+    """call_tool dispatch and handler results, with the calendar integration mocked"""
+
+    @pytest.mark.asyncio
+    async def test_unknown_tool_returns_error(self, server):
+        result = json.loads((await server.call_tool("no_such_tool", {"x": 1}))[0].text)
+
+        assert result == {"error": "Unknown tool: no_such_tool", "tool": "no_such_tool", "arguments": {"x": 1}}
+
+    @pytest.mark.asyncio
+    async def test_unavailable_integration_returns_error(self, server):
+        with patch.object(server, "google_calendar", None):
+            result = json.loads((await server.call_tool("list_calendars", {}))[0].text)
+
+        assert result == {"error": "Google Calendar integration not available"}
+
+    @pytest.mark.asyncio
+    async def test_list_calendars_is_cached(self, server):
+        calendar = Calendar(id="primary", provider="google", name="Me", is_primary=True)
+        server.google_calendar.list_calendars = AsyncMock(return_value=[calendar])
+
+        await server.call_tool("list_calendars", {})
+        result = json.loads((await server.call_tool("list_calendars", {}))[0].text)
+
+        assert result["count"] == 1
+        assert result["calendars"][0]["id"] == "primary"
+        server.google_calendar.list_calendars.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_create_calendar_event_clears_events_cache(self, server):
+        start = datetime(2024, 1, 2, 9)
+        server.google_calendar.create_event = AsyncMock(return_value=make_event("e1", start))
+        window = {"start_time": "2024-01-02T00:00:00", "end_time": "2024-01-02T23:59:00"}
+
+        await server.call_tool("list_calendar_events", window)
+        result = json.loads((await server.call_tool("create_calendar_event", {
+            "calendar_id": "primary", "title": "Event e1",
+            "start_time": "2024-01-02T09:00:00", "end_time": "2024-01-02T10:00:00"
+        }))[0].text)
+        await server.call_tool("list_calendar_events", window)
+
+        assert result["success"] is True
+        assert result["event"]["id"] == "e1"
+        request = server.google_calendar.create_event.await_args.args[0]
+        assert request.start_time == start and request.attendees == []
+        assert server.google_calendar.list_events.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_create_calendar_events_reports_failures(self, server):
+        start = datetime(2024, 1, 2, 9)
+        failure = {"index": 1, "title": "Second", "error": "forbidden"}
+        server.google_calendar.create_events_bulk = AsyncMock(return_value=([make_event("e1", start)], [failure]))
+
+        result = json.loads((await server.call_tool("create_calendar_events", {"events": [
+            {"calendar_id": "primary", "title": "First",
+             "start_time": "2024-01-02T09:00:00", "end_time": "2024-01-02T10:00:00"},
+            {"calendar_id": "team", "title": "Second",
+             "start_time": "2024-01-02T11:00:00", "end_time": "2024-01-02T12:00:00"}
+        ]}))[0].text)
+
+        assert result["success"] is False
+        assert result["count"] == 1
+        assert result["failures"] == [failure]
+        requests = server.google_calendar.create_events_bulk.await_args.args[0]
+        assert [(r.calendar_id, r.title) for r in requests] == [("primary", "First"), ("team", "Second")]
+
+    def test_bulk_create_schema_shares_single_event_schema(self, server):
+        tools = {tool.name: tool for tool in server._TOOLS}
+        if not tools:
+            pytest.skip("calendar tools are not offered without Google Calendar settings")
+
+        single = tools["create_calendar_event"].inputSchema
+        assert tools["create_calendar_events"].inputSchema["properties"]["events"]["items"] is single
+        assert single["required"] == ["calendar_id", "title", "start_time", "end_time"]
+
+    @pytest.mark.asyncio
+    async def test_large_event_lists_encoded_off_loop(self, server):
+        events = [make_event(f"e{i}", datetime(2024, 1, 2, 9)) for i in range(server._results.offload_threshold + 1)]
+        server.google_calendar.list_events = AsyncMock(return_value=events)
+
+        with patch.object(server.asyncio, "to_thread", wraps=server.asyncio.to_thread) as to_thread:
+            result = await server.call_tool("list_calendar_events", {})
+
+        assert json.loads(result[0].text)["count"] == len(events)
+        to_thread.assert_called_once()
+
+
+class TestEventsCache:
+    """list_events results are reused briefly through the server's LRU"""
+
+    @staticmethod
+    def window(day):
+        return {"start_time": f"2024-01-{day:02d}T00:00:00", "end_time": f"2024-01-{day:02d}T23:59:00"}
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_is_served_from_cache(self, server):
+        await server.call_tool("list_calendar_events", self.window(2))
+        await server.call_tool("list_calendar_events", self.window(2))
+
+        assert server.google_calendar.list_events.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_after_ttl(self, server):
+        with patch.object(server.time, "monotonic", return_value=1000.0):
+            await server.call_tool("list_calendar_events", self.window(2))
+        with patch.object(server.time, "monotonic", return_value=1000.0 + server.EVENTS_CACHE_TTL):
+            await server.call_tool("list_calendar_events", self.window(2))
+
+        assert server.google_calendar.list_events.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_entry_is_evicted(self, server):
+        with patch.object(server, "EVENTS_CACHE_MAX_ENTRIES", 2):
+            for day in (2, 3, 2, 4):
+                await server.call_tool("list_calendar_events", self.window(day))
+            assert server.google_calendar.list_events.await_count == 3
+
+            # Day 3 was the least recently used entry when day 4 was added
+            await server.call_tool("list_calendar_events", self.window(2))
+            await server.call_tool("list_calendar_events", self.window(3))
+
+        assert server.google_calendar.list_events.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_relative_ranges_share_a_key_within_the_minute(self, server):
+        """get_upcoming_events rounds now down, so calls seconds apart hit the cache"""
+        times = iter([datetime(2024, 1, 2, 9, 30, 5), datetime(2024, 1, 2, 9, 30, 40)])
+
+        class FakeDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return next(times)
+
+        with patch.object(server, "datetime", FakeDatetime):
+            first = await server.call_tool("get_upcoming_events", {})
+            await server.call_tool("get_upcoming_events", {})
+
+        assert server.google_calendar.list_events.await_count == 1
+        assert json.loads(first[0].text)["time_range"]["start"] == "2024-01-02T09:30:00"
+
+    @pytest.mark.asyncio
+    async def test_conflict_search_reads_through_cache(self, server):
+        arguments = {"calendar_ids": ["primary"], **self.window(2)}
+        await server.call_tool("find_scheduling_conflicts", arguments)
+        result = await server.call_tool("find_scheduling_conflicts", arguments)
+
+        assert json.loads(result[0].text) == {"conflict_count": 0, "conflicts": []}
+        assert server.google_calendar.list_events.await_count == 1
+        server.google_calendar.detect_conflicts.assert_called_with([])
+
 def run_all_tests():
     """Run all tests"""
     print("🚀 Starting User Context Server Tests\n")